@@ -7,16 +7,16 @@ import pandas as pd
 import numpy as np
 from collections import defaultdict
 
-from ..integrations.helius import HeliusAPI
-from ..integrations.jupiter import JupiterAPI
+from ..integrations.helius import get_helius
+from ..integrations.jupiter import get_jupiter
 from ..database.db_manager import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
 class AnalysisTools:
     def __init__(self):
-        self.helius = HeliusAPI()
-        self.jupiter = JupiterAPI()
+        self.helius = get_helius()
+        self.jupiter = get_jupiter()
         self.db = DatabaseManager()
         
     async def screen_tokens(self, criteria: Dict) -> List[Dict]:
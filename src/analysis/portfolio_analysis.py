@@ -5,15 +5,15 @@ import json
 from pathlib import Path
 from collections import defaultdict
 
-from ..integrations.helius import HeliusAPI
-from ..integrations.jupiter import JupiterAPI
+from ..integrations.helius import get_helius
+from ..integrations.jupiter import get_jupiter
 
 logger = logging.getLogger(__name__)
 
 class PortfolioAnalysis:
     def __init__(self):
-        self.helius = HeliusAPI()
-        self.jupiter = JupiterAPI()
+        self.helius = get_helius()
+        self.jupiter = get_jupiter()
         self.data_dir = Path(__file__).parent.parent.parent / "data"
         self.data_dir.mkdir(exist_ok=True)
         
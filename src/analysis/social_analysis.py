@@ -1,20 +1,40 @@
+import asyncio
 import logging
+import os
+import random
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set
-import json
+import heapq
 from pathlib import Path
+import numpy as np
+import pandas as pd
 import tweepy
-from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import re
 from collections import defaultdict
+from operator import itemgetter
 
-from ..integrations.helius import HeliusAPI
+from ..caching.ttl_cache import TTLCache
+from ..integrations.helius import get_helius
+from ..utils.json_utils import dumps, read_json, write_bytes_atomic, write_json
+from ..utils.rate_limiter import AsyncRateLimiter
+from ..utils.write_behind import WriteBehind
 
 logger = logging.getLogger(__name__)
 
+# Twitter v1.1 allows 50 searches and 900 user lookups per 15 minute window
+TWITTER_SEARCH_LIMIT = (50, 900)
+TWITTER_USER_LIMIT = (900, 900)
+TWITTER_MAX_RETRIES = 5
+TWITTER_MAX_BACKOFF = 60
+
+_REACH_KEY = itemgetter("reach")
+
 class SocialAnalysis:
     def __init__(self):
-        self.helius = HeliusAPI()
+        self.helius = get_helius()
+        self._sia = SentimentIntensityAnalyzer()
         self.data_dir = Path(__file__).parent.parent.parent / "data"
         self.data_dir.mkdir(exist_ok=True)
         
@@ -22,44 +42,78 @@ class SocialAnalysis:
         self.notable_wallets_file = self.data_dir / "notable_wallets.json"
         
         # Initialize Twitter API
+        self._twitter_creds = {
+            "api_key": os.getenv("TWITTER_API_KEY", ""),
+            "api_secret": os.getenv("TWITTER_API_SECRET", ""),
+            "access_token": os.getenv("TWITTER_ACCESS_TOKEN", ""),
+            "access_secret": os.getenv("TWITTER_ACCESS_SECRET", "")
+        }
         self.twitter_api = self._init_twitter_api()
+        self._search_limiter = AsyncRateLimiter(*TWITTER_SEARCH_LIMIT)
+        self._user_limiter = AsyncRateLimiter(*TWITTER_USER_LIMIT)
+        
+        # Social signals change slowly; cache results to spare the Twitter quota
+        self._presence_cache = TTLCache(maxsize=1024, ttl=600)
+        self._history_cache = TTLCache(maxsize=2048, ttl=1800)
+        
+        # Debounced persistence of social data and notable wallets
+        self.flush_interval = 5
+        self._writers = {
+            "social": WriteBehind(
+                lambda: dumps(self.social_data, indent=True),
+                lambda payload: write_bytes_atomic(self.social_data_file, payload),
+                delay=self.flush_interval,
+                name="social data"
+            ),
+            "wallets": WriteBehind(
+                lambda: dumps(self.notable_wallets, indent=True),
+                lambda payload: write_bytes_atomic(self.notable_wallets_file, payload),
+                delay=self.flush_interval,
+                name="notable wallets"
+            )
+        }
         
         self._load_data()
         
     def _init_twitter_api(self) -> Optional[tweepy.API]:
         """Initialize Twitter API connection"""
         try:
-            auth = tweepy.OAuthHandler(
-                self._get_env("TWITTER_API_KEY"),
-                self._get_env("TWITTER_API_SECRET")
-            )
-            auth.set_access_token(
-                self._get_env("TWITTER_ACCESS_TOKEN"),
-                self._get_env("TWITTER_ACCESS_SECRET")
-            )
+            creds = self._twitter_creds
+            auth = tweepy.OAuthHandler(creds["api_key"], creds["api_secret"])
+            auth.set_access_token(creds["access_token"], creds["access_secret"])
             return tweepy.API(auth)
         except Exception as e:
             logger.error(f"Error initializing Twitter API: {str(e)}")
             return None
             
-    def _get_env(self, key: str) -> str:
-        """Get environment variable"""
-        import os
-        return os.getenv(key, "")
-        
+    async def _call_twitter(self, limiter: AsyncRateLimiter, func, **kwargs):
+        """Run a blocking tweepy call under a rate limiter, retrying on 429"""
+        for attempt in range(TWITTER_MAX_RETRIES):
+            async with limiter:
+                try:
+                    return await asyncio.to_thread(func, **kwargs)
+                except tweepy.TooManyRequests as e:
+                    if attempt == TWITTER_MAX_RETRIES - 1:
+                        raise
+                    delay = 2 ** attempt + random.random()
+                    reset = e.response.headers.get("x-rate-limit-reset") if e.response is not None else None
+                    if reset:
+                        delay = max(delay, float(reset) - time.time())
+                    delay = min(delay, TWITTER_MAX_BACKOFF)
+                    logger.warning(f"Twitter rate limit hit, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
     def _load_data(self):
         """Load data from files"""
         try:
             if self.social_data_file.exists():
-                with open(self.social_data_file, 'r') as f:
-                    self.social_data = json.load(f)
+                self.social_data = read_json(self.social_data_file)
             else:
                 self.social_data = {"mentions": {}, "sentiment": {}, "history": {}}
                 self._save_social_data()
 
             if self.notable_wallets_file.exists():
-                with open(self.notable_wallets_file, 'r') as f:
-                    self.notable_wallets = json.load(f)
+                self.notable_wallets = read_json(self.notable_wallets_file)
             else:
                 self.notable_wallets = {"wallets": [], "interactions": {}}
                 self._save_notable_wallets()
@@ -69,17 +123,32 @@ class SocialAnalysis:
             self.social_data = {"mentions": {}, "sentiment": {}, "history": {}}
             self.notable_wallets = {"wallets": [], "interactions": {}}
 
+        # In-memory index for O(1) membership checks; the list stays on disk
+        self._notable_set = set(self.notable_wallets["wallets"])
+
     def _save_social_data(self):
-        with open(self.social_data_file, 'w') as f:
-            json.dump(self.social_data, f, indent=2)
+        write_json(self.social_data_file, self.social_data)
 
     def _save_notable_wallets(self):
-        with open(self.notable_wallets_file, 'w') as f:
-            json.dump(self.notable_wallets, f, indent=2)
+        write_json(self.notable_wallets_file, self.notable_wallets)
+
+    def _mark_dirty(self, name: str):
+        """Schedule a background save of a data file"""
+        self._writers[name].mark_dirty()
+
+    async def shutdown(self) -> None:
+        """Stop the background writers and persist pending changes"""
+        for writer in self._writers.values():
+            await writer.aclose()
 
     async def analyze_social_presence(self, token_address: str, project_twitter: Optional[str] = None) -> Dict:
         """Analyze social media presence and sentiment"""
         try:
+            cache_key = (token_address, project_twitter)
+            cached = self._presence_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
             # Get Twitter mentions
             mentions = await self._track_mentions(token_address, project_twitter)
             
@@ -104,9 +173,9 @@ class SocialAnalysis:
                 "notable_interactions": len(notable_interactions)
             })
             
-            self._save_social_data()
+            self._mark_dirty("social")
             
-            return {
+            result = {
                 "token_address": token_address,
                 "mentions_analysis": mentions,
                 "sentiment_analysis": sentiment,
@@ -114,6 +183,8 @@ class SocialAnalysis:
                 "project_history": project_history,
                 "timestamp": current_time
             }
+            self._presence_cache.set(cache_key, result)
+            return result
 
         except Exception as e:
             logger.error(f"Error analyzing social presence for {token_address}: {str(e)}")
@@ -130,45 +201,52 @@ class SocialAnalysis:
             if project_twitter:
                 search_terms.append(f"@{project_twitter}")
 
-            for term in search_terms:
-                tweets = self.twitter_api.search_tweets(
+            # Run the blocking searches concurrently off the event loop
+            results = await asyncio.gather(*[
+                self._call_twitter(
+                    self._search_limiter,
+                    self.twitter_api.search_tweets,
                     q=term,
                     lang="en",
                     count=100,
                     result_type="recent"
                 )
-                
+                for term in search_terms
+            ])
+
+            for tweets in results:
                 for tweet in tweets:
+                    followers = tweet.user.followers_count
+                    retweets = tweet.retweet_count
+                    likes = tweet.favorite_count
                     mentions.append({
                         "text": tweet.text,
                         "user": tweet.user.screen_name,
-                        "followers": tweet.user.followers_count,
+                        "followers": followers,
                         "created_at": tweet.created_at.isoformat(),
-                        "retweets": tweet.retweet_count,
-                        "likes": tweet.favorite_count
+                        "retweets": retweets,
+                        "likes": likes,
+                        "reach": followers * (retweets + likes)
                     })
 
             # Group by time periods
-            hourly = defaultdict(int)
-            daily = defaultdict(int)
-            
-            for mention in mentions:
-                created = datetime.fromisoformat(mention["created_at"])
-                hour = created.strftime("%Y-%m-%d %H:00")
-                day = created.strftime("%Y-%m-%d")
-                
-                hourly[hour] += 1
-                daily[day] += 1
+            created = pd.to_datetime([m["created_at"] for m in mentions])
+            hourly = {
+                ts.strftime("%Y-%m-%d %H:00"): int(count)
+                for ts, count in created.floor("H").value_counts().sort_index().items()
+            }
+            daily = {
+                ts.strftime("%Y-%m-%d"): int(count)
+                for ts, count in created.floor("D").value_counts().sort_index().items()
+            }
 
             return {
                 "total_mentions": len(mentions),
                 "unique_users": len(set(m["user"] for m in mentions)),
                 "total_reach": sum(m["followers"] for m in mentions),
-                "hourly_mentions": dict(hourly),
-                "daily_mentions": dict(daily),
-                "top_mentions": sorted(mentions, 
-                                    key=lambda x: x["followers"] * (x["retweets"] + x["likes"]),
-                                    reverse=True)[:10]
+                "hourly_mentions": hourly,
+                "daily_mentions": daily,
+                "top_mentions": heapq.nlargest(10, mentions, key=_REACH_KEY)
             }
 
         except Exception as e:
@@ -181,34 +259,60 @@ class SocialAnalysis:
             if not mentions or "top_mentions" not in mentions:
                 return {}
 
+            top_mentions = mentions["top_mentions"]
+            n = len(top_mentions)
+            reach = np.fromiter(
+                (
+                    m["reach"] if m.get("reach") is not None
+                    else m["followers"] * (m["retweets"] + m["likes"])
+                    for m in top_mentions
+                ),
+                dtype=np.float64,
+                count=n
+            )
+
+            # Without any reach the weighted sentiment is zero; skip scoring
+            if not reach.any():
+                return {
+                    "overall_sentiment": 0.0,
+                    "sentiment_categories": {"positive": 0, "neutral": 0, "negative": 0},
+                    "average_subjectivity": 0.0,
+                    "detailed_sentiments": []
+                }
+
+            polarity = np.empty(n, dtype=np.float64)
+            subjectivity = np.empty(n, dtype=np.float64)
             sentiments = []
-            for mention in mentions["top_mentions"]:
-                analysis = TextBlob(mention["text"])
+
+            # Single pass: score each mention and fill the arrays.
+            # VADER's compound score is used as polarity and the share of
+            # non-neutral lexicon hits (pos + neg) as subjectivity.
+            polarity_scores = self._sia.polarity_scores
+            for i, mention in enumerate(top_mentions):
+                scores = polarity_scores(mention["text"])
+                polarity[i] = scores["compound"]
+                subjectivity[i] = scores["pos"] + scores["neg"]
                 sentiments.append({
                     "text": mention["text"],
-                    "polarity": analysis.sentiment.polarity,
-                    "subjectivity": analysis.sentiment.subjectivity,
-                    "reach": mention["followers"] * (mention["retweets"] + mention["likes"])
+                    "polarity": scores["compound"],
+                    "subjectivity": scores["pos"] + scores["neg"],
+                    "reach": mention.get("reach", reach[i].item())
                 })
 
             # Calculate weighted sentiment
-            total_reach = sum(s["reach"] for s in sentiments)
-            if total_reach > 0:
-                weighted_sentiment = sum(s["polarity"] * s["reach"] for s in sentiments) / total_reach
-            else:
-                weighted_sentiment = 0
+            weighted_sentiment = float(np.average(polarity, weights=reach))
 
             # Categorize sentiments
             categories = {
-                "positive": len([s for s in sentiments if s["polarity"] > 0.2]),
-                "neutral": len([s for s in sentiments if -0.2 <= s["polarity"] <= 0.2]),
-                "negative": len([s for s in sentiments if s["polarity"] < -0.2])
+                "positive": int((polarity > 0.2).sum()),
+                "neutral": int(((polarity >= -0.2) & (polarity <= 0.2)).sum()),
+                "negative": int((polarity < -0.2).sum())
             }
 
             return {
                 "overall_sentiment": weighted_sentiment,
                 "sentiment_categories": categories,
-                "average_subjectivity": sum(s["subjectivity"] for s in sentiments) / len(sentiments) if sentiments else 0,
+                "average_subjectivity": float(subjectivity.mean()),
                 "detailed_sentiments": sentiments
             }
 
@@ -225,13 +329,14 @@ class SocialAnalysis:
                 return []
 
             notable_interactions = []
+            updates = defaultdict(list)
             for tx in transactions:
                 from_address = tx.get("from")
                 to_address = tx.get("to")
                 
                 # Check if either address is notable
-                notable_from = from_address in self.notable_wallets["wallets"]
-                notable_to = to_address in self.notable_wallets["wallets"]
+                notable_from = from_address in self._notable_set
+                notable_to = to_address in self._notable_set
                 
                 if notable_from or notable_to:
                     interaction = {
@@ -250,16 +355,20 @@ class SocialAnalysis:
                         
                     notable_interactions.append(interaction)
                     
-                    # Update interaction history
-                    if interaction["notable_wallet"] not in self.notable_wallets["interactions"]:
-                        self.notable_wallets["interactions"][interaction["notable_wallet"]] = []
-                    self.notable_wallets["interactions"][interaction["notable_wallet"]].append({
+                    # Buffer interaction history updates
+                    updates[interaction["notable_wallet"]].append({
                         "token": token_address,
                         "timestamp": interaction["timestamp"],
                         "type": interaction["type"]
                     })
 
-            self._save_notable_wallets()
+            # Merge buffered updates into the persisted history in one step
+            history = self.notable_wallets["interactions"]
+            for wallet, items in updates.items():
+                history.setdefault(wallet, []).extend(items)
+
+            if notable_interactions:
+                self._mark_dirty("wallets")
             return notable_interactions
 
         except Exception as e:
@@ -272,11 +381,21 @@ class SocialAnalysis:
             if not self.twitter_api or not project_twitter:
                 return {}
 
+            cached = self._history_cache.get(project_twitter)
+            if cached is not None:
+                return cached
+
             # Get project Twitter account
-            user = self.twitter_api.get_user(screen_name=project_twitter)
+            user = await self._call_twitter(
+                self._user_limiter,
+                self.twitter_api.get_user,
+                screen_name=project_twitter
+            )
             
             # Get recent tweets
-            tweets = self.twitter_api.user_timeline(
+            tweets = await self._call_twitter(
+                self._user_limiter,
+                self.twitter_api.user_timeline,
                 screen_name=project_twitter,
                 count=100,
                 include_rts=False
@@ -296,7 +415,7 @@ class SocialAnalysis:
             avg_engagement = sum(e["retweets"] + e["likes"] + e["replies"] 
                                for e in engagement) / len(engagement) if engagement else 0
 
-            return {
+            history = {
                 "account_age_days": (datetime.now() - user.created_at).days,
                 "followers": user.followers_count,
                 "following": user.friends_count,
@@ -305,6 +424,8 @@ class SocialAnalysis:
                 "engagement_history": engagement,
                 "verified": user.verified if hasattr(user, 'verified') else False
             }
+            self._history_cache.set(project_twitter, history)
+            return history
 
         except Exception as e:
             logger.error(f"Error analyzing project history: {str(e)}")
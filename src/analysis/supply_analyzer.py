@@ -1,42 +1,82 @@
+import heapq
 import logging
+import numpy as np
 from typing import Dict, List, Optional
-from ..integrations.helius import HeliusAPI
-from ..integrations.jupiter import JupiterAPI
+from ..integrations.helius import get_helius
+from ..integrations.jupiter import get_jupiter
+from ..utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
+@njit(cache=True)
+def _distribution_score(whale_count: int, top_10_percent: float, unique_holders: int) -> float:
+    """Score supply distribution from 0 to 100"""
+    # Penalize for too many whales
+    whale_penalty = max(0.0, (whale_count - 2) * 20.0)
+    
+    # Penalize for high concentration in top 10
+    concentration_penalty = max(0.0, (top_10_percent - 25.0) * 2.0)
+    
+    # Bonus for more unique holders
+    holder_bonus = min(20.0, unique_holders / 100.0)
+    
+    score = 100.0 - whale_penalty - concentration_penalty + holder_bonus
+    return max(0.0, min(100.0, score))
+
+def _top_indices(amounts: np.ndarray, n: int) -> np.ndarray:
+    """Indices of the n largest amounts, ties resolved in favour of earlier entries"""
+    n = min(n, len(amounts))
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+    cutoff = -np.partition(-amounts, n - 1)[n - 1]
+    above = np.flatnonzero(amounts > cutoff)
+    ties = np.flatnonzero(amounts == cutoff)[:n - len(above)]
+    return np.concatenate((above, ties))
+
 class SupplyAnalyzer:
     def __init__(self):
-        self.helius = HeliusAPI()
-        self.jupiter = JupiterAPI()
+        self.helius = get_helius()
+        self.jupiter = get_jupiter()
         
     async def analyze_supply_distribution(self, token_address: str) -> Dict:
         """Analyze token supply distribution"""
         try:
-            # Get all token holders
-            holders = await self.helius.get_token_holders(token_address)
-            
-            # Sort holders by balance
-            sorted_holders = sorted(holders, key=lambda x: float(x.get("amount", 0)), reverse=True)
+            # Stream holders page by page, keeping running totals and a
+            # bounded min-heap of (amount, -position, address) for the top 30
+            total_supply = 0.0
+            unique_holders = 0
+            top_heap = []
             
-            # Calculate total supply
-            total_supply = sum(float(h.get("amount", 0)) for h in holders)
+            async for page in self.helius.iter_token_holders(token_address):
+                amounts = np.fromiter(
+                    (float(h.get("amount", 0)) for h in page),
+                    dtype=np.float64,
+                    count=len(page)
+                )
+                total_supply += float(amounts.sum())
+                
+                for i in _top_indices(amounts, 30):
+                    entry = (float(amounts[i]), -(unique_holders + int(i)), page[i].get("address"))
+                    if len(top_heap) < 30:
+                        heapq.heappush(top_heap, entry)
+                    elif entry > top_heap[0]:
+                        heapq.heapreplace(top_heap, entry)
+                        
+                unique_holders += len(page)
+                
+            if total_supply <= 0:
+                logger.warning(f"No supply held for token {token_address}")
+                return {}
+                
+            top_holders = sorted(top_heap, reverse=True)
+            percents = [amount * 100.0 / total_supply for amount, _, _ in top_holders]
             
-            # Analyze distribution
-            whale_count = 0
-            top_10_percent = 0
-            unique_holders = len(holders)
+            # Analyze distribution. At most 12 holders can each own more
+            # than 8% of supply, so every whale is among the top 30.
+            whale_count = sum(1 for percent in percents if percent > 8)
             
-            for holder in sorted_holders:
-                balance = float(holder.get("amount", 0))
-                percent = (balance / total_supply) * 100
-                
-                if percent > 8:
-                    whale_count += 1
-                    
             # Calculate top 10 holders percentage (excluding known addresses)
-            top_10 = sorted_holders[:10]
-            top_10_percent = sum(float(h.get("amount", 0)) for h in top_10) / total_supply * 100
+            top_10_percent = sum(percents[:10])
             
             return {
                 "total_supply": total_supply,
@@ -50,11 +90,11 @@ class SupplyAnalyzer:
                 ),
                 "holders": [
                     {
-                        "address": h.get("address"),
-                        "balance": float(h.get("amount", 0)),
-                        "percent": (float(h.get("amount", 0)) / total_supply) * 100
+                        "address": address,
+                        "balance": amount,
+                        "percent": percent
                     }
-                    for h in sorted_holders[:30]  # Return top 30 holders
+                    for (amount, _, address), percent in zip(top_holders, percents)  # Return top 30 holders
                 ]
             }
             
@@ -65,19 +105,7 @@ class SupplyAnalyzer:
     def _calculate_distribution_score(self, whale_count: int, top_10_percent: float, unique_holders: int) -> float:
         """Calculate supply distribution score"""
         try:
-            # Penalize for too many whales
-            whale_penalty = max(0, (whale_count - 2) * 20)
-            
-            # Penalize for high concentration in top 10
-            concentration_penalty = max(0, (top_10_percent - 25) * 2)
-            
-            # Bonus for more unique holders
-            holder_bonus = min(20, (unique_holders / 100))
-            
-            # Calculate final score (0-100)
-            score = 100 - whale_penalty - concentration_penalty + holder_bonus
-            
-            return max(0, min(100, score))
+            return _distribution_score(int(whale_count), float(top_10_percent), int(unique_holders))
             
         except Exception as e:
             logger.error(f"Error calculating distribution score: {str(e)}")
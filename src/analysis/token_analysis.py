@@ -6,9 +6,20 @@ from datetime import datetime, timedelta
 from ..utils.validation import validate_solana_address
 from ..test.mock_data import get_mock_token, should_use_mock_data
 from ..events.event_manager import event_manager
+from ..utils.jit import njit
 
 logger = logging.getLogger(__name__)
 
+@njit(cache=True)
+def _weighted_risk_score(holder_concentration: float, price_volatility: float, volume_change: float) -> float:
+    """Weighted risk score clamped between 0 and 1"""
+    risk_score = (
+        holder_concentration * 0.4 +
+        price_volatility * 0.3 +
+        volume_change * 0.3
+    )
+    return min(max(risk_score, 0.0), 1.0)
+
 class TokenAnalyzer:
     """Analyzes token metrics and patterns"""
     def __init__(self):
@@ -17,13 +28,13 @@ class TokenAnalyzer:
         self.logger = logging.getLogger(__name__)
         self.is_running = False
 
-    def _get_cached_analysis(self, token_address: str) -> Optional[Dict]:
+    def _get_cached_analysis(self, token_address: str, now: Optional[datetime] = None) -> Optional[Dict]:
         """Get cached token analysis if available"""
         if token_address not in self.token_cache:
             return None
             
         cached = self.token_cache[token_address]
-        if datetime.now() - cached["timestamp"] > timedelta(hours=1):
+        if (now or datetime.now()) - cached["timestamp"] > timedelta(hours=1):
             del self.token_cache[token_address]
             return None
             
@@ -44,9 +55,10 @@ class TokenAnalyzer:
         """Analyze a token's metrics and patterns"""
         try:
             token_address = token_data["address"]
+            now = datetime.now()
 
             # Check cache first
-            cached = self._get_cached_analysis(token_address)
+            cached = self._get_cached_analysis(token_address, now)
             if cached:
                 await event_manager.emit("token_analysis_complete", cached)
                 return cached
@@ -61,6 +73,8 @@ class TokenAnalyzer:
             else:
                 token = token_data
 
+            now_iso = now.isoformat()
+
             # Calculate risk score
             risk_score = self._calculate_risk_score(token)
 
@@ -74,13 +88,13 @@ class TokenAnalyzer:
                     "volume_change": token.get("volume_change", 0.0),
                     "risk_score": risk_score
                 },
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso
             }
 
             # Cache results
             self.token_cache[token_address] = {
                 "data": analysis,
-                "timestamp": datetime.now()
+                "timestamp": now
             }
 
             # Emit analysis complete event
@@ -96,7 +110,7 @@ class TokenAnalyzer:
                         "risk_score": risk_score,
                         "metrics": analysis["metrics"]
                     },
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso
                 })
 
             return analysis
@@ -113,20 +127,7 @@ class TokenAnalyzer:
             price_volatility = float(token_data.get("price_volatility", 0.0))
             volume_change = float(token_data.get("volume_change", 0.0))
             
-            # Calculate weighted score
-            weights = {
-                "holder_concentration": 0.4,
-                "price_volatility": 0.3,
-                "volume_change": 0.3
-            }
-            
-            risk_score = (
-                holder_concentration * weights["holder_concentration"] +
-                price_volatility * weights["price_volatility"] +
-                volume_change * weights["volume_change"]
-            )
-            
-            return min(max(risk_score, 0.0), 1.0)  # Clamp between 0 and 1
+            return _weighted_risk_score(holder_concentration, price_volatility, volume_change)
             
         except Exception as e:
             self.logger.error(f"Error calculating risk score: {str(e)}")
@@ -142,6 +143,8 @@ class TokenAnalyzer:
                 # TODO: Implement real token data fetching
                 token_data = {}
 
+            now_iso = datetime.now().isoformat()
+
             # Calculate price metrics
             old_price = price_data.get("old_price", 0.0)
             new_price = price_data.get("new_price", 0.0)
@@ -151,7 +154,7 @@ class TokenAnalyzer:
                 "token_address": token_address,
                 "token_name": token_data.get("name", "Unknown"),
                 "token_symbol": token_data.get("symbol", "???"),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
                 "price_data": price_data,
                 "metrics": {
                     "price_change": price_change,
@@ -174,7 +177,7 @@ class TokenAnalyzer:
                         "new_price": new_price,
                         "percent_change": price_change * 100
                     },
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now_iso
                 }
                 await event_manager.emit("alert_generated", alert_data)
 
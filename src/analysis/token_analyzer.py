@@ -1,80 +1,288 @@
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import sys
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime, timedelta
-import json
+from functools import cached_property
 from pathlib import Path
-from ..integrations.helius import HeliusAPI
-from ..integrations.jupiter import JupiterAPI
+from types import MappingProxyType
+import aiohttp
+import numpy as np
+from ..error_handling.api_errors import APIError
+from ..integrations.helius import get_helius
+from ..integrations.jupiter import get_jupiter
 from ..integrations.twitter import TwitterAPI
 from .wallet_tracker import WalletTracker
 from .supply_analyzer import SupplyAnalyzer
+from ..caching.ttl_cache import TTLCache
+from ..utils.json_utils import dumps, read_json, write_bytes_atomic
+from ..utils.rate_limiter import AsyncRateLimiter
+from ..utils.jit import njit
+from ..utils.write_behind import WriteBehind
 
 logger = logging.getLogger(__name__)
 
+# Helius results shared by all analyzer instances. Holder data is
+# short-lived; a deployer's past deployments change slowly.
+HOLDERS_TTL = 30
+WALLET_HISTORY_TTL = 300
+
+_helius_cache = TTLCache(maxsize=1024, ttl=HOLDERS_TTL)
+
+# Retry policy for upstream rate limit errors
+RATE_LIMIT_RETRIES = 4
+RATE_LIMIT_BASE_DELAY = 0.5
+RATE_LIMIT_MAX_WAIT = 10
+
+# Deployer history is priced in batches until the outcome is decided
+DEPLOYER_BATCH_SIZE = 20
+DEPLOYER_MAX_FAILURE_RATE = 0.97
+
+# SPL token program and its mint initialization instruction
+_TOKEN_PROGRAM_IDS = frozenset({"TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"})
+_INIT_MINT = sys.intern("initializeMint")
+
+# Confidence score weights per analysis stage
+_W_DEPLOYER, _W_SUPPLY, _W_HOLDER, _W_TWITTER, _W_TOP = 0.25, 0.25, 0.2, 0.15, 0.15
+
+# Failures from upstream calls or malformed upstream data. Anything else
+# is a bug and propagates to analyze_token.
+_UPSTREAM_ERRORS = (
+    APIError,
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    KeyError,
+    IndexError,
+    ValueError
+)
+
+# Stage failure results; read-only, so each failure returns a copy
+_ERR_DEPLOYER = MappingProxyType({"passed": False, "reason": "analysis_error"})
+_ERR_SUPPLY = MappingProxyType({})
+_ERR_HOLDERS = MappingProxyType({"passed": False, "reason": "analysis_error"})
+_ERR_TWITTER = MappingProxyType({"mention_count": 0, "sentiment": 0, "notable_mentions": ()})
+_ERR_TOP_HOLDERS = MappingProxyType({"successful_holders": 0, "average_win_rate": 0, "average_pnl": 0})
+_STAGE_FALLBACKS = (_ERR_DEPLOYER, _ERR_SUPPLY, _ERR_HOLDERS, _ERR_TWITTER)
+
+@njit(cache=True, fastmath=True)
+def _confidence_scores(features: np.ndarray) -> np.ndarray:
+    """Confidence scores for rows of packed stage features
+
+    Columns: failure_rate, distribution_score, buy_ratio, holder_count,
+    mention_count, sentiment, notable_count, average_win_rate.
+    """
+    scores = np.empty(features.shape[0])
+    for i in range(features.shape[0]):
+        f = features[i]
+        # Lower buy ratio is better, more holders is better
+        holder_score = (1.0 - f[2]) * 50.0 + min(f[3] * 1e-3, 1.0) * 50.0
+        # Mentions, sentiment (-1 to 1) and notable mentions
+        twitter_score = (
+            min(f[4] * 1e-2, 1.0) * 40.0 +
+            (f[5] + 1.0) * 0.5 * 30.0 +
+            min(f[6] * 0.2, 1.0) * 30.0
+        )
+        score = (
+            _W_DEPLOYER * (1.0 - f[0]) * 100.0 +
+            _W_SUPPLY * f[1] +
+            _W_HOLDER * holder_score +
+            _W_TWITTER * twitter_score +
+            _W_TOP * f[7] * 100.0
+        )
+        scores[i] = min(100.0, score)
+    return scores
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Check whether an upstream error is a rate limit rejection"""
+    if getattr(error, "status", None) == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "rate limit" in message
+
 class TokenAnalyzer:
+    # Per-upstream limiters shared by all instances
+    _helius_limiter = AsyncRateLimiter(10, 1)
+    _jupiter_limiter = AsyncRateLimiter(10, 1)
+    _twitter_limiter = AsyncRateLimiter(50, 900)
+    
+    # In-flight analyze_token runs shared by all instances
+    _inflight: Dict[tuple, asyncio.Task] = {}
+    
     def __init__(self):
-        self.helius = HeliusAPI()
-        self.jupiter = JupiterAPI()
-        self.twitter = TwitterAPI()
-        self.wallet_tracker = WalletTracker()
-        self.supply_analyzer = SupplyAnalyzer()
+        self._classification_semaphore = asyncio.Semaphore(16)
         self.data_dir = Path(__file__).parent.parent.parent / "data"
         self.blacklist_file = self.data_dir / "blacklist.json"
         self._load_blacklist()
         
+        # Background blacklist writer, started on first change
+        self._blacklist_writer = WriteBehind(
+            lambda: dumps(self.blacklist, indent=True),
+            self._write_blacklist,
+            delay=2.0,
+            name="blacklist"
+        )
+        
+    # Clients and helper analyzers are built on first use, so tokens
+    # rejected by the blacklist fast path never construct them
+    @cached_property
+    def helius(self):
+        return get_helius()
+        
+    @cached_property
+    def jupiter(self):
+        return get_jupiter()
+        
+    @cached_property
+    def twitter(self) -> TwitterAPI:
+        return TwitterAPI()
+        
+    @cached_property
+    def wallet_tracker(self) -> WalletTracker:
+        return WalletTracker()
+        
+    @cached_property
+    def supply_analyzer(self) -> SupplyAnalyzer:
+        return SupplyAnalyzer()
+        
     def _load_blacklist(self):
         """Load blacklist data"""
         try:
             if self.blacklist_file.exists():
-                with open(self.blacklist_file, 'r') as f:
-                    self.blacklist = json.load(f)
+                self.blacklist = read_json(self.blacklist_file)
             else:
                 self.blacklist = {"deployers": [], "tokens": []}
                 
-        except Exception as e:
-            logger.error(f"Error loading blacklist: {str(e)}")
+        except (OSError, ValueError) as e:
+            logger.error("Error loading blacklist: %s", e)
             self.blacklist = {"deployers": [], "tokens": []}
             
-    def _save_blacklist(self):
-        """Save blacklist data"""
-        try:
-            with open(self.blacklist_file, 'w') as f:
-                json.dump(self.blacklist, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving blacklist: {str(e)}")
-            
+        # Sets for O(1) membership checks; the lists are kept for persistence
+        self._deployer_set = set(self.blacklist.get("deployers", []))
+        self._token_set = set(self.blacklist.get("tokens", []))
+            
+    def _write_blacklist(self, payload: bytes):
+        """Write serialized blacklist data"""
+        write_bytes_atomic(self.blacklist_file, payload)
+            
+    async def aclose(self):
+        """Stop the background writers and save pending changes"""
+        await self._blacklist_writer.aclose()
+        if "wallet_tracker" in self.__dict__:
+            await self.wallet_tracker.aclose()
+            
+    async def _rate_limited(self, limiter: AsyncRateLimiter, func, *args, **kwargs):
+        """Call an upstream coroutine under a rate limiter, backing off on 429s"""
+        for attempt in range(RATE_LIMIT_RETRIES):
+            async with limiter:
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == RATE_LIMIT_RETRIES - 1 or not _is_rate_limited(e):
+                        raise
+            delay = min(RATE_LIMIT_MAX_WAIT, RATE_LIMIT_BASE_DELAY * 2 ** attempt)
+            logger.warning("Upstream rate limit hit, retrying in %.1fs", delay)
+            await asyncio.sleep(delay)
+            
+    async def _cached_helius_call(self, method: str, address: str, ttl: float):
+        """Call a Helius method through the shared cache, coalescing concurrent misses"""
+        return await _helius_cache.get_or_compute(
+            (method, address),
+            lambda: self._rate_limited(self._helius_limiter, getattr(self.helius, method), address),
+            ttl
+        )
+        
+    async def _limited_pages(self, limiter: AsyncRateLimiter, pages: AsyncIterator[List[Dict]]) -> AsyncIterator[List[Dict]]:
+        """Pull pages from an upstream iterator, one limiter token per page"""
+        while True:
+            await limiter.acquire()
+            try:
+                page = await pages.__anext__()
+            except StopAsyncIteration:
+                return
+            yield page
+            
+    async def _cached_token_holders(self, token_address: str) -> List[Dict]:
+        """Get token holders, cached"""
+        return await self._cached_helius_call("get_token_holders", token_address, HOLDERS_TTL)
+        
+    async def _cached_deployments(self, deployer_address: str) -> List[Dict]:
+        """Get a deployer's token deployments, cached"""
+        return await _helius_cache.get_or_compute(
+            ("deployments", deployer_address),
+            lambda: self._scan_deployments(deployer_address),
+            WALLET_HISTORY_TTL
+        )
+        
+    async def _scan_deployments(self, deployer_address: str) -> List[Dict]:
+        """Stream a deployer's history and collect its token deployments"""
+        token_deployments = []
+        pages = self._limited_pages(
+            self._helius_limiter,
+            self.helius.iter_wallet_history(deployer_address)
+        )
+        async for page in pages:
+            for tx in page:
+                if any(p in _TOKEN_PROGRAM_IDS for p in tx.get("programIds", ())):
+                    for ix in tx.get("instructions", ()):
+                        if ix.get("name") == _INIT_MINT:
+                            token_deployments.append({
+                                "token": ix.get("accounts", [])[0],
+                                "timestamp": tx.get("timestamp")
+                            })
+        return token_deployments
+        
     async def analyze_token(self, token_address: str, deployer_address: str) -> Dict:
-        """Analyze a token comprehensively"""
+        """Analyze a token comprehensively, sharing in-flight runs for the same token"""
+        key = (token_address, deployer_address)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._analyze_token(token_address, deployer_address))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so a cancelled caller doesn't cancel the run for the others
+        return await asyncio.shield(task)
+        
+    async def _analyze_token(self, token_address: str, deployer_address: str) -> Dict:
+        """Run the full analysis pipeline for a token"""
         try:
             # Check blacklist
-            if deployer_address in self.blacklist["deployers"]:
+            if deployer_address in self._deployer_set:
                 return {"status": "rejected", "reason": "blacklisted_deployer"}
                 
-            if token_address in self.blacklist["tokens"]:
+            if token_address in self._token_set:
                 return {"status": "rejected", "reason": "blacklisted_token"}
                 
-            # 1. Deployer History Check
-            deployer_analysis = await self._analyze_deployer(deployer_address)
+            # Run the independent analysis stages concurrently
+            results = await asyncio.gather(
+                self._analyze_deployer(deployer_address),  # 1. Deployer History Check
+                self.supply_analyzer.analyze_supply_distribution(token_address),  # 2. Supply Distribution Check
+                self._analyze_holders(token_address, deployer_address),  # 3. Holder & Transaction Analysis
+                self._analyze_twitter(token_address),  # 4. Twitter Analysis
+                return_exceptions=True
+            )
+            (
+                deployer_analysis,
+                supply_analysis,
+                holder_analysis,
+                twitter_analysis
+            ) = self._resolve_stage_results(results)
+            
+            # Apply rejections in stage order
             if not deployer_analysis["passed"]:
-                self.blacklist["deployers"].append(deployer_address)
-                self._save_blacklist()
+                if deployer_address not in self._deployer_set:
+                    self._deployer_set.add(deployer_address)
+                    self.blacklist["deployers"].append(deployer_address)
+                    self._blacklist_writer.mark_dirty()
                 return {"status": "rejected", "reason": "deployer_history"}
                 
-            # 2. Supply Distribution Check
-            supply_analysis = await self.supply_analyzer.analyze_supply_distribution(token_address)
             if supply_analysis.get("whale_count", 0) > 2:
                 return {"status": "rejected", "reason": "whale_concentration"}
                 
-            # 3. Holder & Transaction Analysis
-            holder_analysis = await self._analyze_holders(token_address, deployer_address)
             if not holder_analysis["passed"]:
                 return {"status": "rejected", "reason": "holder_analysis"}
                 
-            # 4. Twitter Analysis
-            twitter_analysis = await self._analyze_twitter(token_address)
-            
-            # 5. Top Holder Analysis
-            top_holder_analysis = await self._analyze_top_holders(token_address)
+            # 5. Top Holder Analysis (reuses the supply distribution result)
+            top_holder_analysis = await self._analyze_top_holders(token_address, supply_analysis)
             
             # Calculate confidence score
             confidence_score = self._calculate_confidence_score(
@@ -98,100 +306,158 @@ class TokenAnalyzer:
             }
             
         except Exception as e:
-            logger.error(f"Error analyzing token: {str(e)}")
+            logger.error("Error analyzing token: %s", e)
             return {"status": "error", "reason": str(e)}
             
+    def _resolve_stage_results(self, results: List) -> List[Dict]:
+        """Replace upstream stage failures with that stage's failure result
+
+        Any other exception is a bug and is re-raised.
+        """
+        resolved = []
+        for result, fallback in zip(results, _STAGE_FALLBACKS):
+            if isinstance(result, _UPSTREAM_ERRORS):
+                logger.error("Error in token analysis stage: %s", result)
+                result = dict(fallback)
+            elif isinstance(result, BaseException):
+                raise result
+            resolved.append(result)
+        return resolved
+        
     async def _analyze_deployer(self, deployer_address: str) -> Dict:
         """Analyze deployer history"""
         try:
-            # Get deployer's transaction history
-            transactions = await self.helius.get_wallet_history(deployer_address)
-            
-            # Find token deployments
-            token_deployments = []
-            for tx in transactions:
-                if "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA" in tx.get("programIds", []):
-                    for ix in tx.get("instructions", []):
-                        if ix.get("name") == "initializeMint":
-                            token_deployments.append({
-                                "token": ix.get("accounts", [])[0],
-                                "timestamp": tx.get("timestamp")
-                            })
+            # Find token deployments in the deployer's transaction history
+            token_deployments = await self._cached_deployments(deployer_address)
                             
             if not token_deployments:
                 return {"passed": True, "reason": "new_deployer"}
                 
-            # Analyze past tokens' performance
+            # Analyze past tokens' performance in batches, stopping as soon
+            # as the pass/fail outcome can no longer change
+            total = len(token_deployments)
             failed_tokens = 0
             successful_tokens = 0
-            
-            for deployment in token_deployments:
-                # Get token price info
-                price_info = await self.jupiter.get_token_price(deployment["token"])
-                liquidity_info = await self.jupiter.get_token_liquidity(deployment["token"])
+            evaluated = 0
+            while evaluated < total:
+                batch = token_deployments[evaluated:evaluated + DEPLOYER_BATCH_SIZE]
+                batch_failed, batch_successful = await self._classify_deployments(batch)
+                failed_tokens += batch_failed
+                successful_tokens += batch_successful
+                evaluated += len(batch)
                 
-                market_cap = price_info.get("price", 0) * liquidity_info.get("totalSupply", 0)
-                
-                if market_cap < 200000:
-                    failed_tokens += 1
-                elif market_cap > 3000000:
-                    successful_tokens += 1
+                remaining = total - evaluated
+                if failed_tokens / total >= DEPLOYER_MAX_FAILURE_RATE:
+                    break  # Already rejected
+                if (failed_tokens + remaining) / total < DEPLOYER_MAX_FAILURE_RATE:
+                    break  # Cannot be rejected anymore
                     
-            failure_rate = failed_tokens / len(token_deployments) if token_deployments else 0
+            # Rate over all deployments, as for the pass decision; deployments
+            # skipped after an early exit count as not failed
+            failure_rate = failed_tokens / total
             
             return {
-                "passed": failure_rate < 0.97,
+                "passed": failure_rate < DEPLOYER_MAX_FAILURE_RATE,
                 "failure_rate": failure_rate,
-                "total_deployments": len(token_deployments),
+                "total_deployments": total,
+                "evaluated_deployments": evaluated,
+                "decided_early": evaluated < total,
                 "successful_tokens": successful_tokens
             }
             
-        except Exception as e:
-            logger.error(f"Error analyzing deployer: {str(e)}")
-            return {"passed": False, "reason": "analysis_error"}
-            
+        except _UPSTREAM_ERRORS as e:
+            logger.error("Error analyzing deployer: %s", e)
+            return dict(_ERR_DEPLOYER)
+            
+    async def _classify_deployments(self, deployments: List[Dict]) -> tuple:
+        """Count failed and successful tokens in a batch of deployments"""
+        # Fetch price and liquidity for every token in the batch concurrently
+        token_ids = [d["token"] for d in deployments]
+        price_infos, liquidity_infos = await asyncio.gather(
+            asyncio.gather(*[
+                self._rate_limited(self._jupiter_limiter, self.jupiter.get_token_price, t)
+                for t in token_ids
+            ]),
+            asyncio.gather(*[
+                self._rate_limited(self._jupiter_limiter, self.jupiter.get_token_liquidity, t)
+                for t in token_ids
+            ])
+        )
+        
+        # Classify market caps in one vectorized pass
+        prices = np.fromiter(
+            (p.get("price", 0) for p in price_infos),
+            dtype=np.float64,
+            count=len(price_infos)
+        )
+        supplies = np.fromiter(
+            (l.get("totalSupply", 0) for l in liquidity_infos),
+            dtype=np.float64,
+            count=len(liquidity_infos)
+        )
+        market_caps = prices * supplies
+        return int((market_caps < 200000).sum()), int((market_caps > 3000000).sum())
+        
     async def _analyze_holders(self, token_address: str, deployer_address: str) -> Dict:
         """Analyze token holders and transactions"""
         try:
             # Get holder data
-            holders = await self.helius.get_token_holders(token_address)
+            holders = await self._cached_token_holders(token_address)
             
-            # Get recent transfers
-            transfers = await self.helius.get_token_transfers(token_address)
+            # Precompute membership sets for the transfer scan
+            top5_addresses = {h.get("address") for h in holders[:5]}
+            snipers = self.wallet_tracker.sniper_set()
             
-            # Count unique buyers and sellers
-            buyers = set()
-            sellers = set()
+            # Count buy and sell transfers and collect the wallets involved
+            n_buys = 0
+            n_sells = 0
+            wallets = set()
             sniper_count = 0
             insider_count = 0
             deployer_sold = False
             
-            for transfer in transfers:
-                buyer = transfer.get("receiver", {}).get("address")
-                seller = transfer.get("sender", {}).get("address")
+            # Stream recent transfers page by page
+            pages = self._limited_pages(
+                self._helius_limiter,
+                self.helius.iter_token_transfers(token_address)
+            )
+            async for page in pages:
+                for transfer in page:
+                    receiver = transfer.get("receiver")
+                    sender = transfer.get("sender")
+                    buyer = receiver.get("address") if receiver else None
+                    seller = sender.get("address") if sender else None
                 
-                if buyer:
-                    buyers.add(buyer)
-                    # Check if buyer is a known sniper
-                    if self.wallet_tracker.is_sniper(buyer):
-                        sniper_count += 1
-                    # Check if buyer is a known insider
-                    if buyer in [h.get("address") for h in holders[:5]]:
-                        insider_count += 1
+                    if buyer:
+                        wallets.add(buyer)
+                        n_buys += 1
+                        # Check if buyer is a known sniper
+                        if buyer in snipers:
+                            sniper_count += 1
+                        # Check if buyer is a known insider
+                        if buyer in top5_addresses:
+                            insider_count += 1
                         
-                if seller:
-                    sellers.add(seller)
-                    # Check if deployer sold
-                    if seller == deployer_address:
-                        deployer_sold = True
+                    if seller:
+                        wallets.add(seller)
+                        n_sells += 1
+                        # Check if deployer sold
+                        if seller == deployer_address:
+                            deployer_sold = True
                         
-            # Calculate buy/sell ratio
-            total_transactions = len(buyers) + len(sellers)
-            buy_ratio = len(buyers) / total_transactions if total_transactions > 0 else 0
-            
-            # Update wallet classifications
-            for address in buyers | sellers:
-                await self.wallet_tracker.update_wallet_classification(address)
+            # Calculate buy/sell ratio over transfer volume
+            total_transactions = n_buys + n_sells
+            buy_ratio = n_buys / total_transactions if total_transactions > 0 else 0
+            
+            # Update wallet classifications concurrently, bounded by a semaphore
+            async def update_classification(address: str):
+                async with self._classification_semaphore:
+                    return await self.wallet_tracker.update_wallet_classification(address)
+                    
+            await asyncio.gather(
+                *[update_classification(address) for address in wallets],
+                return_exceptions=True
+            )
                 
             passed = (
                 sniper_count <= 2 and
@@ -209,15 +475,19 @@ class TokenAnalyzer:
                 "deployer_sold": deployer_sold
             }
             
-        except Exception as e:
-            logger.error(f"Error analyzing holders: {str(e)}")
-            return {"passed": False, "reason": "analysis_error"}
+        except _UPSTREAM_ERRORS as e:
+            logger.error("Error analyzing holders: %s", e)
+            return dict(_ERR_HOLDERS)
             
     async def _analyze_twitter(self, token_address: str) -> Dict:
         """Analyze Twitter presence and sentiment"""
         try:
             # Get Twitter mentions and sentiment
-            twitter_data = await self.twitter.analyze_token_mentions(token_address)
+            twitter_data = await self._rate_limited(
+                self._twitter_limiter,
+                self.twitter.analyze_token_mentions,
+                token_address
+            )
             
             # Get notable mentions
             notable_mentions = []
@@ -236,38 +506,37 @@ class TokenAnalyzer:
                 "engagement_score": twitter_data.get("engagement_score", 0)
             }
             
-        except Exception as e:
-            logger.error(f"Error analyzing Twitter: {str(e)}")
-            return {"mention_count": 0, "sentiment": 0, "notable_mentions": []}
+        except _UPSTREAM_ERRORS as e:
+            logger.error("Error analyzing Twitter: %s", e)
+            return dict(_ERR_TWITTER)
             
-    async def _analyze_top_holders(self, token_address: str) -> Dict:
+    async def _analyze_top_holders(self, token_address: str, supply_analysis: Dict) -> Dict:
         """Analyze top holder performance"""
         try:
             # Get top 30 holders
-            supply_analysis = await self.supply_analyzer.analyze_supply_distribution(token_address)
             top_holders = supply_analysis.get("holders", [])[:30]
             
-            successful_holders = 0
-            total_pnl = 0
-            
-            for holder in top_holders:
-                address = holder.get("address")
-                stats = self.wallet_tracker.get_wallet_stats(address)
+            if not top_holders:
+                return dict(_ERR_TOP_HOLDERS)
                 
-                if stats:
-                    if stats.get("metrics", {}).get("win_rate", 0) > 0.5:
-                        successful_holders += 1
-                    total_pnl += stats.get("metrics", {}).get("total_pnl", 0)
-                    
+            addresses = [h.get("address") for h in top_holders if h.get("address")]
+            stats_map = self.wallet_tracker.get_many_wallet_stats(addresses)
+            
+            # Holders without stats count as zero win rate and PnL
+            metrics = [stats.get("metrics", {}) for stats in stats_map.values()]
+            win_rates = np.fromiter((m.get("win_rate", 0) for m in metrics), dtype=np.float64, count=len(metrics))
+            pnls = np.fromiter((m.get("total_pnl", 0) for m in metrics), dtype=np.float64, count=len(metrics))
+            successful_holders = int((win_rates > 0.5).sum())
+            
             return {
                 "successful_holders": successful_holders,
-                "average_win_rate": successful_holders / len(top_holders) if top_holders else 0,
-                "average_pnl": total_pnl / len(top_holders) if top_holders else 0
+                "average_win_rate": successful_holders / len(top_holders),
+                "average_pnl": float(pnls.sum()) / len(top_holders)
             }
             
-        except Exception as e:
-            logger.error(f"Error analyzing top holders: {str(e)}")
-            return {"successful_holders": 0, "average_win_rate": 0, "average_pnl": 0}
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error("Error analyzing top holders: %s", e)
+            return dict(_ERR_TOP_HOLDERS)
             
     def _calculate_confidence_score(self, deployer_analysis: Dict,
                                  supply_analysis: Dict,
@@ -276,34 +545,18 @@ class TokenAnalyzer:
                                  top_holder_analysis: Dict) -> float:
         """Calculate overall confidence score"""
         try:
-            # Deployer score (25%)
-            deployer_score = (
-                (1 - deployer_analysis["failure_rate"]) * 100 * 0.25
-            )
-            
-            # Supply distribution score (25%)
-            supply_score = supply_analysis.get("distribution_score", 0) * 0.25
-            
-            # Holder analysis score (20%)
-            holder_score = (
-                (1 - holder_analysis["buy_ratio"]) * 50 +  # Lower buy ratio is better
-                (min(holder_analysis["holder_count"], 1000) / 1000) * 50  # More holders is better
-            ) * 0.2
-            
-            # Twitter score (15%)
-            twitter_score = (
-                min(twitter_analysis["mention_count"], 100) / 100 * 40 +  # Mentions
-                (twitter_analysis["sentiment"] + 1) / 2 * 30 +  # Sentiment (-1 to 1)
-                min(len(twitter_analysis["notable_mentions"]), 5) / 5 * 30  # Notable mentions
-            ) * 0.15
-            
-            # Top holder score (15%)
-            top_holder_score = (
-                top_holder_analysis["average_win_rate"] * 100 * 0.15
-            )
-            
-            return min(100, deployer_score + supply_score + holder_score + twitter_score + top_holder_score)
-            
-        except Exception as e:
-            logger.error(f"Error calculating confidence score: {str(e)}")
+            features = np.array([[
+                deployer_analysis.get("failure_rate", 0),
+                supply_analysis.get("distribution_score", 0),
+                holder_analysis.get("buy_ratio", 0),
+                holder_analysis.get("holder_count", 0),
+                twitter_analysis.get("mention_count", 0),
+                twitter_analysis.get("sentiment", 0),
+                len(twitter_analysis.get("notable_mentions", ())),
+                top_holder_analysis.get("average_win_rate", 0)
+            ]], dtype=np.float64)
+            return float(_confidence_scores(features)[0])
+            
+        except (TypeError, ValueError) as e:
+            logger.error("Error calculating confidence score: %s", e)
             return 0
@@ -1,40 +1,154 @@
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
 from pathlib import Path
 from collections import defaultdict
+from functools import lru_cache
+import numpy as np
 
+from ..caching.ttl_cache import TTLCache
 from ..integrations.helius import HeliusAPI
 from ..integrations.jupiter import JupiterAPI
+from ..models.transaction import Transaction, to_transactions
+from ..utils.graph import strongly_connected_components
+from ..utils.jit import njit
+from ..utils.json_utils import dumps, loads, read_json, read_json_mapping, write_json
 
 logger = logging.getLogger(__name__)
 
+# Try importing pyarrow, fall back to compacting history into JSON
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("pyarrow package not available. Transaction history will be compacted to JSON.")
+
+# Seconds a token's parsed transactions are reused across one analysis pass
+TRANSACTIONS_TTL = 30
+_transactions_cache = TTLCache(maxsize=1024, ttl=TRANSACTIONS_TTL)
+
+# Appended history records that trigger a compaction into the snapshot
+HISTORY_COMPACT_RECORDS = 10_000
+
+# Sender/receiver values that don't identify a wallet
+_NO_WALLET = frozenset((None, ""))
+
+@dataclass
+class TxArrays:
+    """Transaction columns extracted once and shared by the pattern detectors"""
+    amounts: np.ndarray
+    prices: np.ndarray
+    ts: np.ndarray  # Epoch seconds, NaN when missing
+    is_buy: np.ndarray
+    senders: np.ndarray
+    receivers: np.ndarray
+    signatures: List[Optional[str]]
+    datetimes: List[Optional[datetime]]
+
+    @classmethod
+    def from_transactions(cls, transactions: List[Transaction]) -> "TxArrays":
+        """Build the column arrays in one pass over the transactions"""
+        n = len(transactions)
+        # Naive timestamps are UTC, so they compare with epoch-derived ones
+        datetimes = [
+            tx.timestamp.replace(tzinfo=timezone.utc)
+            if tx.timestamp and tx.timestamp.tzinfo is None else tx.timestamp
+            for tx in transactions
+        ]
+        return cls(
+            amounts=np.fromiter((tx.amount for tx in transactions), dtype=np.float64, count=n),
+            prices=np.fromiter((tx.price for tx in transactions), dtype=np.float64, count=n),
+            ts=np.fromiter(
+                (dt.timestamp() if dt else np.nan for dt in datetimes),
+                dtype=np.float64,
+                count=n
+            ),
+            is_buy=np.fromiter((tx.is_buy for tx in transactions), dtype=bool, count=n),
+            senders=np.array([tx.sender or tx.from_address for tx in transactions], dtype=object),
+            receivers=np.array([tx.receiver or tx.to_address for tx in transactions], dtype=object),
+            signatures=[tx.signature for tx in transactions],
+            datetimes=datetimes
+        )
+
+def _split_time_windows(ts: np.ndarray) -> List[np.ndarray]:
+    """Split timestamped transaction indices into windows at gaps above the average interval"""
+    order = np.flatnonzero(~np.isnan(ts))
+    if not order.size:
+        return []
+    order = order[np.argsort(ts[order], kind="stable")]
+    times = ts[order]
+    if times.size < 2:
+        return [order]
+
+    average_interval = (times[-1] - times[0]) / (times.size - 1)
+    return np.split(order, np.flatnonzero(np.diff(times) > average_interval) + 1)
+
+@njit(cache=True)
+def _price_jumps(prices: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """Indices i where the price moves over 20% to i + 1 within a minute"""
+    n = prices.size
+    hits = np.zeros(max(n - 1, 0), dtype=np.bool_)
+    for i in range(n - 1):
+        p1 = prices[i]
+        p2 = prices[i + 1]
+        if p1 > 0 and p2 > 0 and abs(p2 - p1) / p1 > 0.2:
+            if times[i + 1] - times[i] < 60:
+                hits[i] = True
+    return np.nonzero(hits)[0]
+
+@lru_cache(maxsize=4096)
+def _liquidity_score(total_liquidity: float, depth: float, stability: float) -> float:
+    """Liquidity score from total liquidity, depth and stability"""
+    score = (
+        0.4 * (total_liquidity > 1_000_000) +  # $1M+
+        0.2 * (100_000 < total_liquidity <= 1_000_000) +  # $100k+
+        0.3 * (depth > 0.8) +
+        0.2 * (0.5 < depth <= 0.8) +
+        0.3 * (stability > 0.9) +
+        0.2 * (0.7 < stability <= 0.9)
+    )
+    return min(1.0, score)
+
 class TransactionAnalysis:
-    def __init__(self):
+    def __init__(self, data_dir: Optional[Path] = None):
         self.helius = HeliusAPI()
         self.jupiter = JupiterAPI()
-        self.data_dir = Path(__file__).parent.parent.parent / "data"
+        self.data_dir = data_dir or Path(__file__).parent.parent.parent / "data"
         self.data_dir.mkdir(exist_ok=True)
         
         self.transaction_history_file = self.data_dir / "transaction_history.json"
         self.suspicious_patterns_file = self.data_dir / "suspicious_patterns.json"
+        self.history_log = self.data_dir / "transaction_history.jsonl"
+        # Log being folded into the snapshot while new records go to history_log
+        self.compacting_log = self.data_dir / "transaction_history.compacting.jsonl"
+        self.history_parquet = self.data_dir / "transaction_history.parquet"
+        
+        # Records in the history log, and signatures already recorded per token
+        self._log_records = 0
+        self._history_signatures: Dict[str, set] = {}
+        self._compaction_lock = asyncio.Lock()
         
         self._load_data()
         
     def _load_data(self):
         """Load data from files"""
         try:
-            if self.transaction_history_file.exists():
-                with open(self.transaction_history_file, 'r') as f:
-                    self.transaction_history = json.load(f)
+            # Compacted snapshot first, then records appended since
+            if PYARROW_AVAILABLE and self.history_parquet.exists():
+                self.transaction_history = self._read_history_parquet()
+            elif self.transaction_history_file.exists():
+                self.transaction_history = read_json_mapping(self.transaction_history_file)
             else:
                 self.transaction_history = {}
-                self._save_history()
+            self._replay_history_log()
 
             if self.suspicious_patterns_file.exists():
-                with open(self.suspicious_patterns_file, 'r') as f:
-                    self.suspicious_patterns = json.load(f)
+                self.suspicious_patterns = read_json(self.suspicious_patterns_file)
             else:
                 self.suspicious_patterns = {"patterns": [], "detected": {}}
                 self._save_patterns()
@@ -44,13 +158,133 @@ class TransactionAnalysis:
             self.transaction_history = {}
             self.suspicious_patterns = {"patterns": [], "detected": {}}
 
-    def _save_history(self):
-        with open(self.transaction_history_file, 'w') as f:
-            json.dump(self.transaction_history, f, indent=2)
+    def _read_history_parquet(self) -> Dict:
+        """Read the compacted transaction history"""
+        table = pq.read_table(self.history_parquet, columns=["token", "timestamp", "tx"])
+        history = {}
+        for token, timestamp, tx in zip(
+            table.column("token").to_pylist(),
+            table.column("timestamp").to_pylist(),
+            table.column("tx").to_pylist()
+        ):
+            history.setdefault(token, {}).setdefault(timestamp, []).append(loads(tx))
+        return history
+
+    def _replay_history_log(self):
+        """Apply records appended to the history logs since the last compaction"""
+        if self.compacting_log.exists():
+            # A snapshot written after the rotation already holds these records
+            snapshot = self.history_parquet if PYARROW_AVAILABLE else self.transaction_history_file
+            if snapshot.exists() and snapshot.stat().st_mtime >= self.compacting_log.stat().st_mtime:
+                self.compacting_log.unlink()
+            else:
+                self._replay_log_file(self.compacting_log)
+        self._replay_log_file(self.history_log)
+
+    def _replay_log_file(self, path: Path):
+        if not path.exists():
+            return
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    record = loads(line)
+                except ValueError:
+                    logger.warning("Skipping malformed transaction history record")
+                    continue
+                self.transaction_history.setdefault(record["token"], {}).setdefault(
+                    record["timestamp"], []
+                ).append(record["tx"])
+                self._log_records += 1
+
+    async def _record_history(self, token_address: str, transactions: List[Dict]):
+        """Record fetched transactions that are not in the token's history yet"""
+        known = self._history_signatures.get(token_address)
+        if known is None:
+            known = {
+                tx.get("signature")
+                for bucket in self.transaction_history.get(token_address, {}).values()
+                for tx in bucket
+            }
+            self._history_signatures[token_address] = known
+
+        # Without a signature a transaction can't be told apart from a refetch
+        new = []
+        for tx in transactions:
+            signature = tx.get("signature")
+            if signature and signature not in known:
+                known.add(signature)
+                new.append(tx)
+        if not new:
+            return
+
+        self._append_history(token_address, new)
+        if self._log_records >= HISTORY_COMPACT_RECORDS and not self._compaction_lock.locked():
+            await self._compact_history()
+
+    def _append_history(self, token_address: str, transactions: List[Dict]):
+        """Record transactions, appending them to the history log"""
+        buckets = self.transaction_history.setdefault(token_address, {})
+        lines = []
+        for tx in transactions:
+            timestamp = str(tx.get("timestamp"))
+            buckets.setdefault(timestamp, []).append(tx)
+            lines.append(dumps({"token": token_address, "timestamp": timestamp, "tx": tx}))
+        with open(self.history_log, 'ab') as f:
+            f.write(b"\n".join(lines) + b"\n")
+        self._log_records += len(lines)
+
+    async def _compact_history(self):
+        """Fold the history log into the compacted snapshot without blocking the loop"""
+        async with self._compaction_lock:
+            try:
+                self._rotate_history_log()
+                self._log_records = 0
+                # Buckets keep growing on the loop, so the writer gets its own lists
+                snapshot = {
+                    token: {timestamp: list(bucket) for timestamp, bucket in buckets.items()}
+                    for token, buckets in self.transaction_history.items()
+                }
+                await asyncio.to_thread(self._write_history_snapshot, snapshot)
+            except Exception as e:
+                logger.error(f"Error compacting transaction history: {str(e)}")
+
+    def _rotate_history_log(self):
+        """Move the history log aside, keeping records left by a failed compaction"""
+        if not self.history_log.exists():
+            return
+        if self.compacting_log.exists():
+            with open(self.compacting_log, 'ab') as f:
+                f.write(self.history_log.read_bytes())
+            self.history_log.unlink()
+        else:
+            os.replace(self.history_log, self.compacting_log)
+
+    def _write_history_snapshot(self, history: Dict):
+        """Write the compacted snapshot and drop the log it replaces"""
+        if PYARROW_AVAILABLE:
+            tokens, timestamps, amounts, txs = [], [], [], []
+            for token, buckets in history.items():
+                for timestamp, bucket in buckets.items():
+                    for tx in bucket:
+                        tokens.append(token)
+                        timestamps.append(timestamp)
+                        amounts.append(float(tx.get("amount", 0)))
+                        txs.append(dumps(tx).decode("utf-8"))
+            table = pa.table({
+                "token": pa.array(tokens, type=pa.string()),
+                "timestamp": pa.array(timestamps, type=pa.string()),
+                "amount": pa.array(amounts, type=pa.float64()),
+                "tx": pa.array(txs, type=pa.string())
+            })
+            tmp_path = self.history_parquet.with_suffix(".parquet.tmp")
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, self.history_parquet)
+        else:
+            write_json(self.transaction_history_file, history)
+        self.compacting_log.unlink(missing_ok=True)
 
     def _save_patterns(self):
-        with open(self.suspicious_patterns_file, 'w') as f:
-            json.dump(self.suspicious_patterns, f, indent=2)
+        write_json(self.suspicious_patterns_file, self.suspicious_patterns)
 
     async def initialize(self):
         """Initialize API connections"""
@@ -58,15 +292,30 @@ class TransactionAnalysis:
         await self.jupiter.initialize()
         
     async def close(self):
-        """Close API connections"""
+        """Compact the history log and close API connections"""
+        if self._log_records or self.compacting_log.exists():
+            await self._compact_history()
         await self.helius.close()
         await self.jupiter.close()
 
+    async def _cached_transactions(self, token_address: str) -> List[Transaction]:
+        """Get a token's parsed transactions, fetching them once for concurrent misses"""
+        return await _transactions_cache.get_or_compute(
+            token_address,
+            lambda: self._fetch_transactions(token_address)
+        )
+
+    async def _fetch_transactions(self, token_address: str) -> List[Transaction]:
+        """Fetch a token's transactions, recording them in the history"""
+        raw = await self.helius.get_token_transactions(token_address)
+        await self._record_history(token_address, raw)
+        return to_transactions(raw)
+
     async def analyze_transactions(self, token_address: str, timeframe: str = "1h") -> Dict:
         """Analyze token transactions"""
         try:
             # Get transactions
-            transactions = await self.helius.get_token_transactions(token_address)
+            transactions = await self._cached_transactions(token_address)
             if not transactions:
                 return {
                     "transaction_count": 0,
@@ -78,31 +327,19 @@ class TransactionAnalysis:
                     "suspicious_patterns": []
                 }
 
-            # Calculate metrics
-            buy_volume = 0
-            sell_volume = 0
-            total_volume = 0
-            transaction_sizes = []
-            unique_wallets = set()
-
-            for tx in transactions:
-                amount = float(tx.get("amount", 0))
-                total_volume += amount
-                transaction_sizes.append(amount)
-                
-                if "from_address" in tx:
-                    unique_wallets.add(tx["from_address"])
-                if "to_address" in tx:
-                    unique_wallets.add(tx["to_address"])
-                    
-                if tx.get("is_buy", False):
-                    buy_volume += amount
-                else:
-                    sell_volume += amount
-
-            # Calculate metrics
+            # Calculate metrics in vectorized passes
             transaction_count = len(transactions)
-            avg_transaction_size = sum(transaction_sizes) / max(len(transaction_sizes), 1)
+            arr = TxArrays.from_transactions(transactions)
+            amounts, is_buy = arr.amounts, arr.is_buy
+            total_volume = float(amounts.sum())
+            buy_volume = float(amounts[is_buy].sum())
+            sell_volume = float(amounts[~is_buy].sum())
+            unique_wallets = {
+                w for tx in transactions
+                for w in (tx.from_address, tx.to_address) if w
+            }
+
+            avg_transaction_size = float(amounts.mean())
             buy_sell_ratio = buy_volume / max(sell_volume, 1e-10)  # Avoid division by zero
             
             return {
@@ -110,22 +347,22 @@ class TransactionAnalysis:
                 "buy_sell_ratio": buy_sell_ratio,
                 "avg_transaction_size": avg_transaction_size,
                 "volume_24h": total_volume,
-                "largest_transaction": max(transaction_sizes) if transaction_sizes else 0,
+                "largest_transaction": float(amounts.max()),
                 "unique_wallets": len(unique_wallets),
-                "suspicious_patterns": await self._detect_suspicious_patterns(transactions)
+                "suspicious_patterns": await self._detect_suspicious_patterns(arr)
             }
 
         except Exception as e:
             logger.error(f"Error analyzing transactions for {token_address}: {str(e)}")
             raise
 
-    async def _detect_suspicious_patterns(self, transactions: List[Dict]) -> List[Dict]:
+    async def _detect_suspicious_patterns(self, arr: TxArrays) -> List[Dict]:
         """Detect suspicious transaction patterns"""
         try:
             suspicious = []
             
             # Pattern 1: Wash trading
-            wash_trades = self._detect_wash_trades(transactions)
+            wash_trades = self._detect_wash_trades(arr)
             if wash_trades:
                 suspicious.append({
                     "pattern": "Wash Trading",
@@ -134,7 +371,7 @@ class TransactionAnalysis:
                 })
 
             # Pattern 2: Price manipulation
-            manipulation = self._detect_price_manipulation(transactions)
+            manipulation = self._detect_price_manipulation(arr)
             if manipulation:
                 suspicious.append({
                     "pattern": "Price Manipulation",
@@ -143,7 +380,7 @@ class TransactionAnalysis:
                 })
 
             # Pattern 3: Coordinated buying/selling
-            coordinated = self._detect_coordinated_trading(transactions)
+            coordinated = self._detect_coordinated_trading(arr)
             if coordinated:
                 suspicious.append({
                     "pattern": "Coordinated Trading",
@@ -157,35 +394,51 @@ class TransactionAnalysis:
             logger.error(f"Error detecting suspicious patterns: {str(e)}")
             return []
 
-    def _detect_wash_trades(self, transactions: List[Dict]) -> Optional[Dict]:
-        """Detect wash trading patterns"""
+    def _detect_wash_trades(self, arr: TxArrays) -> Optional[Dict]:
+        """Detect wash trading as value cycling between wallets within a time window"""
         try:
-            # Group transactions by wallet pairs
-            pairs = defaultdict(list)
-            for i in range(len(transactions) - 1):
-                tx1, tx2 = transactions[i], transactions[i + 1]
-                if (tx1.get("from") and tx1.get("to") and
-                    tx2.get("from") and tx2.get("to")):
-                    pair = tuple(sorted([tx1["from"], tx1["to"]]))
-                    pairs[pair].append((tx1, tx2))
-
-            # Analyze patterns
             wash_trades = []
-            for pair, txs in pairs.items():
-                if len(txs) >= 3:  # Multiple back-and-forth trades
-                    amounts = [abs(float(tx[0].get("amount", 0)) - 
-                                 float(tx[1].get("amount", 0)))
-                             for tx in txs]
-                    if all(amt < 0.1 for amt in amounts):  # Similar amounts
-                        wash_trades.append({
-                            "wallets": list(pair),
-                            "trade_count": len(txs),
-                            "average_amount": sum(amounts) / len(amounts)
-                        })
+            senders, receivers, amounts = arr.senders, arr.receivers, arr.amounts
+            untimed = int(np.isnan(arr.ts).sum())
+            if untimed:
+                logger.warning(f"Skipping {untimed} transactions without a timestamp in wash trade detection")
+            for window in _split_time_windows(arr.ts):
+                # Directed transfer graph for the window
+                graph = defaultdict(set)
+                edges = []
+                for k in window:
+                    sender, receiver = senders[k], receivers[k]
+                    if sender and receiver and sender != receiver:
+                        graph[sender].add(receiver)
+                        edges.append((sender, receiver, amounts[k]))
+
+                # Wallets in a strongly connected component can route value back to themselves
+                for component in strongly_connected_components(graph):
+                    if len(component) < 2:
+                        continue
+                    members = set(component)
+                    cycle_amounts = np.array(
+                        [amount for sender, receiver, amount in edges
+                         if sender in members and receiver in members],
+                        dtype=np.float64
+                    )
+                    if cycle_amounts.size < 3:  # Multiple trades around the cycle
+                        continue
+
+                    mean = float(cycle_amounts.mean())
+                    variation = float(cycle_amounts.std() / mean) if mean > 0 else 0.0
+                    wash_trades.append({
+                        "wallets": sorted(members),
+                        "trade_count": int(cycle_amounts.size),
+                        "average_amount": mean,
+                        "amount_variation": variation
+                    })
 
             if wash_trades:
+                # Similar amounts around a cycle are the stronger wash signal
+                similarity = sum(1.0 / (1.0 + t["amount_variation"]) for t in wash_trades) / len(wash_trades)
                 return {
-                    "confidence": min(1.0, len(wash_trades) * 0.2),
+                    "confidence": min(1.0, len(wash_trades) * 0.2 * (0.5 + 0.5 * similarity)),
                     "details": wash_trades
                 }
             return None
@@ -194,29 +447,21 @@ class TransactionAnalysis:
             logger.error(f"Error detecting wash trades: {str(e)}")
             return None
 
-    def _detect_price_manipulation(self, transactions: List[Dict]) -> Optional[Dict]:
+    def _detect_price_manipulation(self, arr: TxArrays) -> Optional[Dict]:
         """Detect price manipulation patterns"""
         try:
-            manipulations = []
+            prices, datetimes, signatures = arr.prices, arr.datetimes, arr.signatures
             
-            # Look for sudden price movements
-            for i in range(len(transactions) - 1):
-                tx1, tx2 = transactions[i], transactions[i + 1]
-                price1 = float(tx1.get("price", 0))
-                price2 = float(tx2.get("price", 0))
-                
-                if price1 > 0 and price2 > 0:
-                    price_change = abs(price2 - price1) / price1
-                    if price_change > 0.2:  # 20% price change
-                        time1 = datetime.fromisoformat(tx1["timestamp"])
-                        time2 = datetime.fromisoformat(tx2["timestamp"])
-                        if (time2 - time1).total_seconds() < 60:  # Within 1 minute
-                            manipulations.append({
-                                "price_change": price_change,
-                                "time_diff": (time2 - time1).total_seconds(),
-                                "tx1": tx1.get("signature"),
-                                "tx2": tx2.get("signature")
-                            })
+            # Look for sudden price movements, then build details for hits only
+            manipulations = []
+            for i in _price_jumps(prices, arr.ts):
+                price1, price2 = prices[i], prices[i + 1]
+                manipulations.append({
+                    "price_change": float(abs(price2 - price1) / price1),
+                    "time_diff": (datetimes[i + 1] - datetimes[i]).total_seconds(),
+                    "tx1": signatures[i],
+                    "tx2": signatures[i + 1]
+                })
 
             if manipulations:
                 return {
@@ -229,35 +474,39 @@ class TransactionAnalysis:
             logger.error(f"Error detecting price manipulation: {str(e)}")
             return None
 
-    def _detect_coordinated_trading(self, transactions: List[Dict]) -> Optional[Dict]:
+    def _detect_coordinated_trading(self, arr: TxArrays) -> Optional[Dict]:
         """Detect coordinated trading patterns"""
         try:
-            # Group transactions by time windows
-            time_windows = defaultdict(list)
-            for tx in transactions:
-                if tx.get("timestamp"):
-                    minute = datetime.fromisoformat(tx["timestamp"]).strftime("%Y-%m-%d %H:%M")
-                    time_windows[minute].append(tx)
+            timed = np.flatnonzero(~np.isnan(arr.ts))
+            if not timed.size:
+                return None
+
+            # Bucket by epoch minute in C
+            minutes = np.floor(arr.ts[timed] / 60).astype(np.int64)
+            _, first, inverse, counts = np.unique(
+                minutes, return_index=True, return_inverse=True, return_counts=True
+            )
+            volumes = np.bincount(inverse, weights=arr.amounts[timed], minlength=counts.size)
+            members_by_bucket = np.argsort(inverse, kind="stable")
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
 
+            # Multiple transactions from multiple wallets in the same minute,
+            # reported in order of first appearance
             coordinated = []
-            for minute, txs in time_windows.items():
-                if len(txs) >= 3:  # Multiple transactions in same minute
-                    wallets = set()
-                    volume = 0
-                    for tx in txs:
-                        if tx.get("from"):
-                            wallets.add(tx["from"])
-                        if tx.get("to"):
-                            wallets.add(tx["to"])
-                        volume += float(tx.get("amount", 0))
-
-                    if len(wallets) >= 3:  # Multiple wallets involved
-                        coordinated.append({
-                            "timestamp": minute,
-                            "wallet_count": len(wallets),
-                            "transaction_count": len(txs),
-                            "volume": volume
-                        })
+            candidates = np.flatnonzero(counts >= 3)
+            senders, receivers = arr.senders, arr.receivers
+            for bucket in candidates[np.argsort(first[candidates], kind="stable")]:
+                members = timed[members_by_bucket[starts[bucket]:starts[bucket] + counts[bucket]]]
+                wallets = set(senders[members])
+                wallets |= set(receivers[members])
+                wallets -= _NO_WALLET
+                if len(wallets) >= 3:
+                    coordinated.append({
+                        "timestamp": arr.datetimes[timed[first[bucket]]].strftime("%Y-%m-%d %H:%M"),
+                        "wallet_count": len(wallets),
+                        "transaction_count": int(counts[bucket]),
+                        "volume": float(volumes[bucket])
+                    })
 
             if coordinated:
                 return {
@@ -301,30 +550,11 @@ class TransactionAnalysis:
     def _calculate_liquidity_score(self, liquidity: Dict) -> float:
         """Calculate liquidity score"""
         try:
-            score = 0.0
-            
-            # Factor 1: Total liquidity
-            total_liquidity = float(liquidity.get("liquidity", 0))
-            if total_liquidity > 1_000_000:  # $1M+
-                score += 0.4
-            elif total_liquidity > 100_000:  # $100k+
-                score += 0.2
-                
-            # Factor 2: Liquidity depth
-            depth = float(liquidity.get("depth", 0))
-            if depth > 0.8:
-                score += 0.3
-            elif depth > 0.5:
-                score += 0.2
-                
-            # Factor 3: Stability
-            stability = float(liquidity.get("stability", 0))
-            if stability > 0.9:
-                score += 0.3
-            elif stability > 0.7:
-                score += 0.2
-                
-            return min(1.0, score)
+            return _liquidity_score(
+                float(liquidity.get("liquidity", 0)),
+                float(liquidity.get("depth", 0)),
+                float(liquidity.get("stability", 0))
+            )
 
         except Exception as e:
             logger.error(f"Error calculating liquidity score: {str(e)}")
@@ -350,22 +580,22 @@ class TransactionAnalysis:
         """Analyze price impact of trades"""
         try:
             # Get recent trades
-            trades = await self.helius.get_token_transactions(token_address)
+            trades = await self._cached_transactions(token_address)
             if not trades:
                 return {}
 
             impacts = []
             for trade in trades:
-                amount = float(trade.get("amount", 0))
-                price_before = float(trade.get("price_before", 0))
-                price_after = float(trade.get("price_after", 0))
+                amount = trade.amount
+                price_before = trade.price_before
+                price_after = trade.price_after
                 
                 if price_before > 0:
                     impact = abs(price_after - price_before) / price_before
                     impacts.append({
                         "amount": amount,
                         "impact": impact,
-                        "timestamp": trade.get("timestamp")
+                        "timestamp": trade.timestamp
                     })
 
             if not impacts:
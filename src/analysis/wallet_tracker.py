@@ -1,52 +1,76 @@
-import json
 import logging
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Set
 from pathlib import Path
-from datetime import datetime, timedelta
-from ..integrations.helius import HeliusAPI
-from ..integrations.jupiter import JupiterAPI
+from collections import defaultdict
+from datetime import datetime
+import numpy as np
+from ..integrations.helius import get_helius
+from ..integrations.jupiter import get_jupiter
+from ..utils.json_utils import dumps, read_json, write_bytes_atomic
+from ..utils.write_behind import WriteBehind
 
 logger = logging.getLogger(__name__)
 
+# Wallet classification lists persisted alongside wallet_stats
+WALLET_LISTS = ("sniper_wallets", "insider_wallets", "good_wallets", "scam_wallets")
+
+# Seconds before a wallet's classification is refreshed
+RECLASSIFY_AFTER = 24 * 60 * 60
+
+# Selling within this many seconds of buying counts as a quick sell
+QUICK_SELL_SECONDS = 5 * 60
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+
 class WalletTracker:
     def __init__(self):
-        self.helius = HeliusAPI()
-        self.jupiter = JupiterAPI()
+        self.helius = get_helius()
+        self.jupiter = get_jupiter()
         self.data_dir = Path(__file__).parent.parent.parent / "data"
         self.wallet_file = self.data_dir / "wallet_data.json"
         self._load_data()
         
+        # Background writer, started on first change
+        self._writer = WriteBehind(
+            lambda: dumps(self._snapshot(), indent=True),
+            self._write_data,
+            delay=1.0,
+            name="wallet data"
+        )
+        
     def _load_data(self):
         """Load wallet data from file"""
         try:
             if self.wallet_file.exists():
-                with open(self.wallet_file, 'r') as f:
-                    self.wallet_data = json.load(f)
+                data = read_json(self.wallet_file)
             else:
-                self.wallet_data = {
-                    "sniper_wallets": [],
-                    "insider_wallets": [],
-                    "good_wallets": [],
-                    "scam_wallets": [],
-                    "wallet_stats": {}
-                }
+                data = {}
         except Exception as e:
             logger.error(f"Error loading wallet data: {str(e)}")
-            self.wallet_data = {
-                "sniper_wallets": [],
-                "insider_wallets": [],
-                "good_wallets": [],
-                "scam_wallets": [],
-                "wallet_stats": {}
-            }
+            data = {}
             
-    def _save_data(self):
-        """Save wallet data to file"""
-        try:
-            with open(self.wallet_file, 'w') as f:
-                json.dump(self.wallet_data, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving wallet data: {str(e)}")
+        # Classification lists are held as sets in memory for O(1) lookups
+        self.wallet_data = {
+            name: set(data.get(name, [])) for name in WALLET_LISTS
+        }
+        self.wallet_data["wallet_stats"] = data.get("wallet_stats", {})
+            
+    def _snapshot(self) -> Dict:
+        """Get wallet data in its on-disk form"""
+        data = {
+            name: list(self.wallet_data[name]) for name in WALLET_LISTS
+        }
+        data["wallet_stats"] = self.wallet_data["wallet_stats"]
+        return data
+        
+    def _write_data(self, payload: bytes):
+        """Write serialized wallet data"""
+        write_bytes_atomic(self.wallet_file, payload)
+                
+    async def aclose(self):
+        """Stop the background writer and save pending changes"""
+        await self._writer.aclose()
             
     async def analyze_wallet(self, address: str) -> Dict:
         """Analyze a wallet's behavior and performance"""
@@ -54,54 +78,44 @@ class WalletTracker:
             # Get wallet's transaction history
             transactions = await self.helius.get_wallet_history(address, days=30)
             
-            # Analyze trading patterns
-            token_trades = {}
-            quick_sells = 0
-            total_trades = 0
-            profitable_trades = 0
+            # Group token transfer timestamps by mint in one pass
+            token_txs = [tx for tx in transactions if TOKEN_PROGRAM_ID in tx.get("programIds", ())]
+            mints = set()
+            transfers = defaultdict(list)
+            for tx in token_txs:
+                token_address = tx.get("tokenTransfers", [{}])[0].get("mint")
+                if token_address:
+                    mints.add(token_address)
+                    if tx.get("type") == "TRANSFER":
+                        transfers[token_address].append(tx["timestamp"])
+            prices = await self.jupiter.get_token_prices(mints)
+            
+            # The first transfer of a token is the buy, later ones are sells
+            buy_times, sell_times, buy_prices, sell_prices = [], [], [], []
+            for token_address, timestamps in transfers.items():
+                current_price = prices.get(token_address, {}).get("price", 0)
+                buy_time = None
+                for timestamp in timestamps:
+                    if not buy_time:
+                        buy_time = timestamp and datetime.fromisoformat(timestamp).timestamp()
+                        continue
+                    buy_times.append(buy_time)
+                    sell_times.append(datetime.fromisoformat(timestamp).timestamp())
+                    buy_prices.append(current_price)
+                    sell_prices.append(current_price)
+                    
+            hold_times = np.array(sell_times, dtype=np.float64) - np.array(buy_times, dtype=np.float64)
+            total_trades = sum(len(timestamps) for timestamps in transfers.values())
+            quick_sells = int((hold_times < QUICK_SELL_SECONDS).sum())
+            profitable_trades = int((np.array(sell_prices, dtype=np.float64) > np.array(buy_prices, dtype=np.float64)).sum())
             
-            for tx in transactions:
-                if "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA" in tx.get("programIds", []):
-                    token_address = tx.get("tokenTransfers", [{}])[0].get("mint")
-                    if token_address:
-                        if token_address not in token_trades:
-                            token_trades[token_address] = {
-                                "buy_time": None,
-                                "sell_time": None,
-                                "buy_price": 0,
-                                "sell_price": 0
-                            }
-                            
-                        # Get token price
-                        price_info = await self.jupiter.get_token_price(token_address)
-                        current_price = price_info.get("price", 0)
-                        
-                        if tx.get("type") == "TRANSFER":
-                            total_trades += 1
-                            trade = token_trades[token_address]
-                            
-                            if not trade["buy_time"]:
-                                trade["buy_time"] = tx["timestamp"]
-                                trade["buy_price"] = current_price
-                            else:
-                                trade["sell_time"] = tx["timestamp"]
-                                trade["sell_price"] = current_price
-                                
-                                # Calculate trade metrics
-                                hold_time = datetime.fromisoformat(trade["sell_time"]) - datetime.fromisoformat(trade["buy_time"])
-                                if hold_time < timedelta(minutes=5):
-                                    quick_sells += 1
-                                    
-                                if trade["sell_price"] > trade["buy_price"]:
-                                    profitable_trades += 1
-                                    
             # Calculate wallet metrics
             metrics = {
                 "total_trades": total_trades,
                 "quick_sells": quick_sells,
                 "quick_sell_ratio": quick_sells / total_trades if total_trades > 0 else 0,
                 "win_rate": profitable_trades / total_trades if total_trades > 0 else 0,
-                "unique_tokens": len(token_trades)
+                "unique_tokens": len(mints)
             }
             
             # Classify wallet behavior
@@ -118,7 +132,8 @@ class WalletTracker:
                 "address": address,
                 "metrics": metrics,
                 "classification": classification,
-                "last_updated": datetime.now().isoformat()
+                "last_updated": datetime.now().isoformat(),
+                "last_updated_ts": time.time()
             }
             
         except Exception as e:
@@ -128,12 +143,11 @@ class WalletTracker:
     async def update_wallet_classification(self, address: str, force_update: bool = False):
         """Update wallet classification"""
         try:
-            current_time = datetime.now()
-            stats = self.wallet_data["wallet_stats"].get(address, {})
-            last_updated = datetime.fromisoformat(stats.get("last_updated", "2000-01-01T00:00:00")) if stats else None
+            stats = self.wallet_data["wallet_stats"].get(address)
+            last_updated = self._last_updated_ts(stats) if stats else None
             
             # Update if never analyzed or last update was more than 24 hours ago
-            if force_update or not last_updated or (current_time - last_updated) > timedelta(hours=24):
+            if force_update or not last_updated or time.time() - last_updated > RECLASSIFY_AFTER:
                 analysis = await self.analyze_wallet(address)
                 
                 if analysis:
@@ -144,27 +158,39 @@ class WalletTracker:
                     classification = analysis["classification"]
                     
                     # Remove from all lists first
-                    for list_name in ["sniper_wallets", "good_wallets", "scam_wallets"]:
-                        if address in self.wallet_data[list_name]:
-                            self.wallet_data[list_name].remove(address)
+                    for list_name in ("sniper_wallets", "good_wallets", "scam_wallets"):
+                        self.wallet_data[list_name].discard(address)
                             
                     # Add to appropriate list
                     if classification == "sniper":
-                        self.wallet_data["sniper_wallets"].append(address)
+                        self.wallet_data["sniper_wallets"].add(address)
                     elif classification == "good_trader":
-                        self.wallet_data["good_wallets"].append(address)
+                        self.wallet_data["good_wallets"].add(address)
                     elif classification == "scammer":
-                        self.wallet_data["scam_wallets"].append(address)
+                        self.wallet_data["scam_wallets"].add(address)
                         
-                    self._save_data()
+                    self._writer.mark_dirty()
                     
         except Exception as e:
             logger.error(f"Error updating wallet classification: {str(e)}")
             
+    def _last_updated_ts(self, stats: Dict) -> float:
+        """Get when wallet stats were last updated as an epoch timestamp"""
+        last_updated = stats.get("last_updated_ts")
+        if last_updated is None:
+            # Stats saved before last_updated_ts was recorded
+            last_updated = datetime.fromisoformat(stats.get("last_updated", "2000-01-01T00:00:00")).timestamp()
+            stats["last_updated_ts"] = last_updated
+        return last_updated
+        
     def is_sniper(self, address: str) -> bool:
         """Check if wallet is a known sniper"""
         return address in self.wallet_data["sniper_wallets"]
         
+    def sniper_set(self) -> Set[str]:
+        """Get known sniper wallets as a set for bulk membership checks"""
+        return self.wallet_data["sniper_wallets"]
+        
     def is_insider(self, address: str) -> bool:
         """Check if wallet is a known insider"""
         return address in self.wallet_data["insider_wallets"]
@@ -180,3 +206,8 @@ class WalletTracker:
     def get_wallet_stats(self, address: str) -> Dict:
         """Get wallet statistics"""
         return self.wallet_data["wallet_stats"].get(address, {})
+        
+    def get_many_wallet_stats(self, addresses: List[str]) -> Dict[str, Dict]:
+        """Get statistics for several wallets, keyed by address"""
+        wallet_stats = self.wallet_data["wallet_stats"]
+        return {address: wallet_stats[address] for address in addresses if address in wallet_stats}
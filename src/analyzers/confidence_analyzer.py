@@ -1,63 +1,132 @@
-from discord_webhook import DiscordWebhook, DiscordEmbed
+import aiohttp
 from datetime import datetime
-import json
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 from src.config import DISCORD_WEBHOOK_URL
+from src.utils.json_utils import read_json
+
+# Shared read-only defaults for missing token data sections
+_EMPTY = MappingProxyType({})
+_EMPTY_LIST = ()
+
+_WEIGHTS_PATH = Path('config/scoring_weights.json')
+
+# Default weights if configuration file doesn't exist
+_DEFAULT_WEIGHTS = {
+    'deployer': {
+        'previous_tokens': 0.15,
+        'success_rate': 0.10,
+        'selling_pattern': 0.10
+    },
+    'holders': {
+        'distribution': 0.10,
+        'top_holder_performance': 0.15,
+        'sniper_activity': -0.05
+    },
+    'social': {
+        'notable_mentions': 0.10,
+        'sentiment': 0.05,
+        'account_age': 0.05
+    },
+    'trading': {
+        'volume': 0.10,
+        'liquidity': 0.10
+    }
+}
+
+# Scale factors mapping raw metrics onto 0-100 before clamping
+_SOLD_TO_PENALTY = 1e-4  # 1M tokens sold is the full penalty
+_HOLDERS_TO_SCORE = 0.1  # 1k holders
+_VOLUME_TO_SCORE = 1e-3  # $100k daily volume
+_LIQUIDITY_TO_SCORE = 2e-3  # $50k liquidity
+
+@lru_cache(maxsize=1)
+def _load_weights():
+    """
+    Read scoring weights once per process; every analyzer shares the result, so don't mutate it
+    """
+    return read_json(_WEIGHTS_PATH) if _WEIGHTS_PATH.exists() else _DEFAULT_WEIGHTS
 
 class ConfidenceAnalyzer:
+    __slots__ = (
+        'weights', 'threshold', '_one_over_thirty_days',
+        '_wd_success', '_wd_selling',
+        '_wh_distribution', '_wh_top_performance', '_wh_sniper',
+        '_ws_mentions', '_ws_sentiment', '_ws_age',
+        '_wt_volume', '_wt_liquidity', '_http'
+    )
+
+    # Constant parts of the Discord notification
+    _WEBHOOK_USERNAME = "Token Analyzer Bot"
+    _EMBED_TITLE = "🚀 High Confidence Token Detected!"
+    _EMBED_COLOR = 0x00ff00
+
+    # Discord summary layout, filled in by format_analysis_summary
+    _SUMMARY_TMPL = (
+        "🔍 Token Analysis Report: {addr}\n"
+        "Confidence Score: {score:.1f}/100\n"
+        "\n🏗️ Deployer Analysis:\n"
+        "- Previous Successful Tokens: {succ}\n"
+        "- Total Sales: {sales}\n"
+        "\n👥 Holder Analysis:\n"
+        "- Total Holders: {holders}\n"
+        "- Sniper Wallets: {snipers}\n"
+        "\n🐦 Social Analysis:\n"
+        "- Notable Mentions: {mentions}\n"
+        "- Sentiment: {sentiment:.2f}\n"
+        "\n📊 Trading Analysis:\n"
+        "- 24h Volume: ${volume:,.2f}\n"
+        "- Liquidity: ${liquidity:,.2f}"
+    )
+
     def __init__(self):
         self.weights = self.load_weights()
         self.threshold = 70  # Minimum confidence score to trigger notification
+        self._bind_weights()
+        self._one_over_thirty_days = 1.0 / (30 * 86400)
+        self._http = None  # Webhook session, created on first notification
 
     def load_weights(self):
         """
         Load scoring weights from configuration
         """
-        try:
-            with open('config/scoring_weights.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            # Default weights if configuration file doesn't exist
-            return {
-                'deployer': {
-                    'previous_tokens': 0.15,
-                    'success_rate': 0.10,
-                    'selling_pattern': 0.10
-                },
-                'holders': {
-                    'distribution': 0.10,
-                    'top_holder_performance': 0.15,
-                    'sniper_activity': -0.05
-                },
-                'social': {
-                    'notable_mentions': 0.10,
-                    'sentiment': 0.05,
-                    'account_age': 0.05
-                },
-                'trading': {
-                    'volume': 0.10,
-                    'liquidity': 0.10
-                }
-            }
+        return _load_weights()
+
+    def _bind_weights(self):
+        """
+        Unpack scoring weights into plain attributes; call again after changing self.weights
+        """
+        w = self.weights
+        self._wd_success = w['deployer']['success_rate']
+        self._wd_selling = w['deployer']['selling_pattern']
+        self._wh_distribution = w['holders']['distribution']
+        self._wh_top_performance = w['holders']['top_holder_performance']
+        self._wh_sniper = w['holders']['sniper_activity']
+        self._ws_mentions = w['social']['notable_mentions']
+        self._ws_sentiment = w['social']['sentiment']
+        self._ws_age = w['social']['account_age']
+        self._wt_volume = w['trading']['volume']
+        self._wt_liquidity = w['trading']['liquidity']
 
     def calculate_deployer_score(self, deployer_data):
         """
         Calculate confidence score based on deployer metrics
         """
         score = 0
-        weights = self.weights['deployer']
         
         # Previous tokens score
         if deployer_data.get('total_tokens', 0) > 0:
             success_rate = deployer_data.get('successful_tokens', 0) / deployer_data['total_tokens']
-            score += weights['success_rate'] * (success_rate * 100)
+            score += self._wd_success * (success_rate * 100)
         
         # Selling pattern score
         if deployer_data.get('total_sales', 0) == 0:
-            score += weights['selling_pattern'] * 100  # Full score if no sales
+            score += self._wd_selling * 100  # Full score if no sales
         else:
             # Penalize based on sale timing and size
-            sale_penalty = min(100, (deployer_data.get('total_amount_sold', 0) / 1000000) * 100)
-            score += weights['selling_pattern'] * (100 - sale_penalty)
+            sale_penalty = min(100.0, deployer_data.get('total_amount_sold', 0) * _SOLD_TO_PENALTY)
+            score += self._wd_selling * (100 - sale_penalty)
 
         return score
 
@@ -65,49 +134,45 @@ class ConfidenceAnalyzer:
         """
         Calculate confidence score based on holder metrics
         """
+        if not holder_data and not performance_data:
+            return 0.0
         score = 0
-        weights = self.weights['holders']
         
         # Holder distribution score
         total_holders = holder_data.get('total_holders', 0)
-        if total_holders > 1000:
-            score += weights['distribution'] * 100
-        else:
-            score += weights['distribution'] * (total_holders / 1000 * 100)
+        score += self._wh_distribution * min(100.0, total_holders * _HOLDERS_TO_SCORE)
         
         # Top holder performance score
         if performance_data:
             avg_win_rate = sum(h['win_rate'] for h in performance_data) / len(performance_data)
-            score += weights['top_holder_performance'] * (avg_win_rate * 100)
+            score += self._wh_top_performance * (avg_win_rate * 100)
         
         # Sniper activity penalty
         sniper_count = holder_data.get('sniper_count', 0)
-        if sniper_count > 0:
-            penalty = min(100, sniper_count * 10)
-            score += weights['sniper_activity'] * penalty
+        score += self._wh_sniper * min(100.0, max(0, sniper_count) * 10.0)
 
         return score
 
-    def calculate_social_score(self, twitter_data):
+    def calculate_social_score(self, twitter_data, now=None):
         """
-        Calculate confidence score based on social metrics
+        Calculate confidence score based on social metrics, aging accounts against now (UTC)
         """
         score = 0
-        weights = self.weights['social']
         
         # Notable mentions score
         notable_mentions = len(twitter_data.get('notable_mentions', []))
         if notable_mentions > 0:
-            score += weights['notable_mentions'] * min(100, notable_mentions * 20)
+            score += self._ws_mentions * min(100, notable_mentions * 20)
         
         # Sentiment score
         sentiment = twitter_data.get('sentiment_score', 0)
-        score += weights['sentiment'] * ((sentiment + 1) * 50)  # Convert -1 to 1 range to 0-100
+        score += self._ws_sentiment * ((sentiment + 1) * 50)  # Convert -1 to 1 range to 0-100
         
         # Account age score
         if twitter_data.get('account_history'):
-            account_age_days = (datetime.utcnow() - twitter_data['account_history']['created_at']).days
-            score += weights['account_age'] * min(100, account_age_days / 30 * 100)
+            now = now or datetime.utcnow()
+            account_age = (now - twitter_data['account_history']['created_at']).total_seconds()
+            score += self._ws_age * min(100, account_age * self._one_over_thirty_days * 100)
 
         return score
 
@@ -115,22 +180,17 @@ class ConfidenceAnalyzer:
         """
         Calculate confidence score based on trading metrics
         """
+        if not trading_data:
+            return 0.0
         score = 0
-        weights = self.weights['trading']
         
         # Volume score
         daily_volume = trading_data.get('volume_24h', 0)
-        if daily_volume > 100000:  # $100k daily volume
-            score += weights['volume'] * 100
-        else:
-            score += weights['volume'] * (daily_volume / 100000 * 100)
+        score += self._wt_volume * min(100.0, daily_volume * _VOLUME_TO_SCORE)
         
         # Liquidity score
         liquidity = trading_data.get('liquidity', 0)
-        if liquidity > 50000:  # $50k liquidity
-            score += weights['liquidity'] * 100
-        else:
-            score += weights['liquidity'] * (liquidity / 50000 * 100)
+        score += self._wt_liquidity * min(100.0, liquidity * _LIQUIDITY_TO_SCORE)
 
         return score
 
@@ -138,19 +198,22 @@ class ConfidenceAnalyzer:
         """
         Calculate overall confidence score based on all metrics
         """
-        score = 0
+        now = datetime.utcnow()
+        get = token_data.get
         
-        # Calculate individual component scores
-        deployer_score = self.calculate_deployer_score(token_data.get('deployer_data', {}))
-        holder_score = self.calculate_holder_score(
-            token_data.get('holder_data', {}),
-            token_data.get('holder_performance', [])
-        )
-        social_score = self.calculate_social_score(token_data.get('twitter_data', {}))
-        trading_score = self.calculate_trading_score(token_data.get('trading_data', {}))
+        # An empty deployer section still earns the no-sales score and an empty
+        # social section the neutral sentiment score, so both always run
+        score = self.calculate_deployer_score(get('deployer_data', _EMPTY))
+        score += self.calculate_social_score(get('twitter_data', _EMPTY), now)
         
-        # Combine scores
-        score = deployer_score + holder_score + social_score + trading_score
+        # Empty holder and trading sections score zero, so skip them
+        holder_data = get('holder_data', _EMPTY)
+        holder_performance = get('holder_performance', _EMPTY_LIST)
+        if holder_data or holder_performance:
+            score += self.calculate_holder_score(holder_data, holder_performance)
+        trading_data = get('trading_data', _EMPTY)
+        if trading_data:
+            score += self.calculate_trading_score(trading_data)
         
         return min(100, max(0, score))  # Ensure score is between 0 and 100
 
@@ -163,27 +226,18 @@ class ConfidenceAnalyzer:
         twitter_data = token_data.get('twitter_data', {})
         trading_data = token_data.get('trading_data', {})
 
-        summary = []
-        summary.append(f"🔍 Token Analysis Report: {token_address}")
-        summary.append(f"Confidence Score: {confidence_score:.1f}/100")
-        
-        summary.append("\n🏗️ Deployer Analysis:")
-        summary.append(f"- Previous Successful Tokens: {deployer_data.get('successful_tokens', 0)}")
-        summary.append(f"- Total Sales: {deployer_data.get('total_sales', 0)}")
-        
-        summary.append("\n👥 Holder Analysis:")
-        summary.append(f"- Total Holders: {holder_data.get('total_holders', 0)}")
-        summary.append(f"- Sniper Wallets: {holder_data.get('sniper_count', 0)}")
-        
-        summary.append("\n🐦 Social Analysis:")
-        summary.append(f"- Notable Mentions: {len(twitter_data.get('notable_mentions', []))}")
-        summary.append(f"- Sentiment: {twitter_data.get('sentiment_score', 0):.2f}")
-        
-        summary.append("\n📊 Trading Analysis:")
-        summary.append(f"- 24h Volume: ${trading_data.get('volume_24h', 0):,.2f}")
-        summary.append(f"- Liquidity: ${trading_data.get('liquidity', 0):,.2f}")
-
-        return "\n".join(summary)
+        return self._SUMMARY_TMPL.format_map({
+            'addr': token_address,
+            'score': confidence_score,
+            'succ': deployer_data.get('successful_tokens', 0),
+            'sales': deployer_data.get('total_sales', 0),
+            'holders': holder_data.get('total_holders', 0),
+            'snipers': holder_data.get('sniper_count', 0),
+            'mentions': len(twitter_data.get('notable_mentions', [])),
+            'sentiment': twitter_data.get('sentiment_score', 0),
+            'volume': trading_data.get('volume_24h', 0),
+            'liquidity': trading_data.get('liquidity', 0)
+        })
 
     async def send_discord_notification(self, token_address, token_data, confidence_score):
         """
@@ -193,24 +247,36 @@ class ConfidenceAnalyzer:
             return False
 
         try:
-            webhook = DiscordWebhook(
-                url=DISCORD_WEBHOOK_URL,
-                username="Token Analyzer Bot"
-            )
-
-            # Create embed
-            embed = DiscordEmbed(
-                title=f"🚀 High Confidence Token Detected!",
-                description=self.format_analysis_summary(token_address, token_data, confidence_score),
-                color=0x00ff00
-            )
-
-            embed.set_footer(text=f"Analysis Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
-            webhook.add_embed(embed)
-            
-            response = webhook.execute()
-            return response.status_code == 200
+            if self._http is None or self._http.closed:
+                self._http = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(keepalive_timeout=30),
+                    timeout=aiohttp.ClientTimeout(total=10)
+                )
+
+            payload = {
+                "username": self._WEBHOOK_USERNAME,
+                "embeds": [{
+                    "title": self._EMBED_TITLE,
+                    "description": self.format_analysis_summary(token_address, token_data, confidence_score),
+                    "color": self._EMBED_COLOR,
+                    "footer": {
+                        "text": f"Analysis Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}"
+                    }
+                }]
+            }
+
+            # wait=true makes Discord reply 200 with the created message
+            async with self._http.post(DISCORD_WEBHOOK_URL, params={"wait": "true"}, json=payload) as response:
+                return response.status == 200
 
         except Exception as e:
             print(f"Error sending Discord notification: {str(e)}")
             return False
+
+    async def close(self):
+        """
+        Close the webhook session
+        """
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
@@ -2,15 +2,136 @@
 import asyncio
 from datetime import datetime, timedelta
 import numpy as np
-from collections import defaultdict
-from typing import Dict, List, Tuple, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Optional, Union
+from ..utils.graph import strongly_connected_components
+from ..utils.jit import NUMBA_AVAILABLE, njit
+
+@njit(cache=True, fastmath=True)
+def _supply_stats(balances_sorted: np.ndarray) -> Tuple[float, float, float]:
+    """Total, largest value and Gini coefficient of non-empty ascending values in a single pass"""
+    n = balances_sorted.shape[0]
+    weighted = 0.0
+    total = 0.0
+    for i in range(n):
+        v = balances_sorted[i]
+        total += v
+        weighted += (i + 1) * v
+    max_val = balances_sorted[n - 1]
+    if total == 0.0:
+        return total, max_val, 0.0
+    return total, max_val, (2 * weighted) / (n * total) - (n + 1) / n
+
+# Below this many values a plain loop beats numpy and JIT dispatch
+_SMALL_SUPPLY = 32
+
+def _sorted_supply_stats(values: Union[List[float], np.ndarray]) -> Tuple[float, float, float]:
+    """Total, largest value and Gini coefficient of non-empty values in any order"""
+    n = len(values)
+    if n >= _SMALL_SUPPLY:
+        balances = np.sort(np.asarray(values, dtype=np.float64))
+        if NUMBA_AVAILABLE:
+            return _supply_stats(balances)
+            
+        # Without numba the kernel is a Python loop, so use a BLAS dot instead
+        total = float(balances.sum())
+        if not total:
+            return total, float(balances[-1]), 0.0
+        weighted = float(np.dot(np.arange(1, n + 1, dtype=np.float64), balances))
+        return total, float(balances[-1]), (2.0 * weighted) / (n * total) - (n + 1) / n
+        
+    sorted_values = sorted(values)
+    weighted = 0.0
+    total = 0.0
+    for i, v in enumerate(sorted_values, 1):
+        weighted += i * v
+        total += v
+    gini = (2 * weighted) / (n * total) - (n + 1) / n if total else 0.0
+    return total, sorted_values[-1], gini
+
+# Integer codes for trade sides; other side values get codes after these
+_SIDE_MAP = {'buy': 0, 'sell': 1, 'BUY': 0, 'SELL': 1}
+
+def _timestamp_column(values: List[Any]) -> np.ndarray:
+    """Epoch seconds for datetime values, otherwise the raw values as an object array"""
+    try:
+        return np.fromiter((v.timestamp() for v in values), dtype=np.float64, count=len(values))
+    except (AttributeError, TypeError):
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+@dataclass
+class TradeArrays:
+    """Trade columns extracted once and shared by the volume and wash trade checks"""
+    amounts: np.ndarray
+    prices: np.ndarray
+    wallet_codes: np.ndarray
+    wallets: List[str]  # Wallet address for each code
+    sides: np.ndarray
+    ts: np.ndarray
+
+    @classmethod
+    def from_trades(cls, trades: List[Dict]) -> "TradeArrays":
+        """Build the column arrays, factorizing wallets and sides into integer codes"""
+        n = len(trades)
+        codes = {}
+        wallet_codes = np.fromiter(
+            (codes.setdefault(t['wallet'], len(codes)) for t in trades),
+            dtype=np.int64,
+            count=n
+        )
+        side_codes = dict(_SIDE_MAP)
+        sides = np.fromiter(
+            (side_codes.setdefault(t.get('side'), len(side_codes)) for t in trades),
+            dtype=np.int32,
+            count=n
+        )
+        return cls(
+            amounts=np.fromiter((float(t['amount']) for t in trades), dtype=np.float64, count=n),
+            prices=np.fromiter((float(t['price']) for t in trades), dtype=np.float64, count=n),
+            wallet_codes=wallet_codes,
+            wallets=list(codes),
+            sides=sides,
+            ts=_timestamp_column([t['timestamp'] for t in trades])
+        )
+
+# Shared default for missing trade data lists
+_EMPTY_LIST = ()
+
+def _all_distinct(values: List) -> bool:
+    """Whether no value repeats, stopping at the first duplicate"""
+    seen = set()
+    for value in values:
+        if value in seen:
+            return False
+        seen.add(value)
+    return True
+
+# Recommendation texts, selected by _generate_recommendations
+_REC_VOLUME = "Exercise caution: Suspicious trading volume patterns detected"
+_REC_SUPPLY = "Be aware: Token supply is highly concentrated"
+_REC_MARKET = "Warning: Unusual market metrics detected"
+_REC_HIGH = (
+    "High Risk: Multiple suspicious patterns detected. "
+    "Thorough due diligence recommended"
+)
+_REC_OK = "No major suspicious patterns detected. Always conduct your own research"
 
 class SuspiciousActivityAnalyzer:
+    __slots__ = (
+        'volume_threshold', 'supply_threshold',
+        'batch_time_threshold', 'similar_amount_threshold'
+    )
+    
     def __init__(self):
         self.volume_threshold = 0.7  # 70% of volume from single source is suspicious
         self.supply_threshold = 0.9  # 90% of supply in single wallet is suspicious
         self.batch_time_threshold = 300  # 5 minutes between batches is suspicious
         self.similar_amount_threshold = 0.05  # 5% difference for similar amounts
+        
+        # Compile the supply kernel up front rather than on the first token
+        _supply_stats(np.ones(2))
     
     async def analyze_token(
         self,
@@ -45,9 +166,11 @@ class SuspiciousActivityAnalyzer:
                 result['risk_score'] = 0.5  # Medium risk due to lack of data
                 return result
 
+            trade_get = trade_data.get
+            
             # Analyze trading patterns
-            trades = trade_data.get('trades', [])
-            volume_analysis = await self.analyze_volume_patterns(trades)
+            trades = trade_get('trades', _EMPTY_LIST)
+            volume_analysis = self.analyze_volume_patterns(trades)
             
             if volume_analysis['is_suspicious']:
                 result['is_suspicious'] = True
@@ -57,10 +180,10 @@ class SuspiciousActivityAnalyzer:
 
             # Analyze token supply if holder analysis is requested
             if include_holder_analysis:
-                initial_transfers = trade_data.get('initial_transfers', [])
-                current_holders = trade_data.get('current_holders', [])
+                initial_transfers = trade_get('initial_transfers', _EMPTY_LIST)
+                current_holders = trade_get('current_holders', _EMPTY_LIST)
                 
-                supply_analysis = await self.analyze_supply_distribution(
+                supply_analysis = self.analyze_supply_distribution(
                     initial_transfers, current_holders
                 )
                 
@@ -72,10 +195,10 @@ class SuspiciousActivityAnalyzer:
 
             # Analyze market metrics
             total_supply = float(token_data.get('total_supply', 0))
-            price = float(trade_data.get('latest_price', 0))
-            volume_24h = float(trade_data.get('total_volume', 0))
+            price = float(trade_get('latest_price', 0))
+            volume_24h = float(trade_get('total_volume', 0))
             
-            market_analysis = await self.get_market_cap_analysis(
+            market_analysis = self.get_market_cap_analysis(
                 total_supply, price, volume_24h
             )
             
@@ -105,37 +228,27 @@ class SuspiciousActivityAnalyzer:
 
     def _generate_recommendations(self, analysis_result: Dict) -> List[str]:
         """Generate recommendations based on analysis results."""
-        recommendations = []
-        
-        if analysis_result['is_suspicious']:
-            if any('volume' in warning.lower() for warning in analysis_result['warnings']):
-                recommendations.append(
-                    "Exercise caution: Suspicious trading volume patterns detected"
-                )
-            
-            if any('supply' in warning.lower() for warning in analysis_result['warnings']):
-                recommendations.append(
-                    "Be aware: Token supply is highly concentrated"
-                )
+        if not analysis_result['is_suspicious']:
+            return [_REC_OK]
             
-            if any('market' in warning.lower() for warning in analysis_result['warnings']):
-                recommendations.append(
-                    "Warning: Unusual market metrics detected"
-                )
-            
-            if analysis_result['risk_score'] > 0.7:
-                recommendations.append(
-                    "High Risk: Multiple suspicious patterns detected. "
-                    "Thorough due diligence recommended"
-                )
-        else:
-            recommendations.append(
-                "No major suspicious patterns detected. Always conduct your own research"
-            )
+        # Lowercase each warning once and collect keyword hits as bits
+        hit = 0
+        for warning in analysis_result['warnings']:
+            lowered = warning.lower()
+            hit |= ('volume' in lowered) | (('supply' in lowered) << 1) | (('market' in lowered) << 2)
             
+        recommendations = []
+        if hit & 1:
+            recommendations.append(_REC_VOLUME)
+        if hit & 2:
+            recommendations.append(_REC_SUPPLY)
+        if hit & 4:
+            recommendations.append(_REC_MARKET)
+        if analysis_result['risk_score'] > 0.7:
+            recommendations.append(_REC_HIGH)
         return recommendations
         
-    async def analyze_volume_patterns(self, trades: List[Dict]) -> Dict:
+    def analyze_volume_patterns(self, trades: List[Dict]) -> Dict:
         """
         Analyze trading volume patterns to detect fake volume
         """
@@ -148,22 +261,17 @@ class SuspiciousActivityAnalyzer:
         if not trades:
             return result
             
-        # Group trades by wallet
-        wallet_volumes = defaultdict(float)
-        total_volume = 0
-        
-        for trade in trades:
-            wallet = trade['wallet']
-            volume = float(trade['amount']) * float(trade['price'])
-            wallet_volumes[wallet] += volume
-            total_volume += volume
+        # Group trade volume by wallet
+        arrays = TradeArrays.from_trades(trades)
+        volumes = arrays.amounts * arrays.prices
+        total_volume = float(volumes.sum())
             
         if total_volume == 0:
             return result
             
         # Check for concentrated volume
-        max_wallet_volume = max(wallet_volumes.values())
-        max_volume_ratio = max_wallet_volume / total_volume
+        wallet_volumes = np.bincount(arrays.wallet_codes, weights=volumes, minlength=len(arrays.wallets))
+        max_volume_ratio = float(wallet_volumes.max()) / total_volume
         
         result['metrics']['total_volume'] = total_volume
         result['metrics']['max_wallet_volume_ratio'] = max_volume_ratio
@@ -175,7 +283,7 @@ class SuspiciousActivityAnalyzer:
             )
             
         # Check for wash trading patterns
-        wash_trades = self._detect_wash_trades(trades)
+        wash_trades = self._detect_wash_trades(trades, arrays)
         if wash_trades:
             result['is_suspicious'] = True
             result['reasons'].append(
@@ -185,43 +293,125 @@ class SuspiciousActivityAnalyzer:
             
         return result
         
-    def _detect_wash_trades(self, trades: List[Dict]) -> List[Dict]:
+    def _detect_wash_trades(
+        self,
+        trades: List[Dict],
+        arrays: Optional[TradeArrays] = None
+    ) -> List[Dict]:
         """
         Detect potential wash trading patterns
         """
-        wash_trades = []
-        wallet_trades = defaultdict(list)
+        if len(trades) < 2:
+            return []
+        if arrays is None:
+            arrays = TradeArrays.from_trades(trades)
+            
+        return self._detect_self_trades(trades, arrays) + self._detect_reciprocal_trades(trades, arrays)
         
-        # Group trades by wallet
-        for trade in trades:
-            wallet_trades[trade['wallet']].append(trade)
-            
-        for wallet, wallet_trade_list in wallet_trades.items():
-            # Sort trades by timestamp
-            sorted_trades = sorted(wallet_trade_list, key=lambda x: x['timestamp'])
-            
-            # Look for alternating buy/sell patterns with similar amounts
-            for i in range(len(sorted_trades) - 1):
-                current_trade = sorted_trades[i]
-                next_trade = sorted_trades[i + 1]
+    def _detect_self_trades(self, trades: List[Dict], arrays: TradeArrays) -> List[Dict]:
+        """
+        Detect a wallet buying and selling back similar amounts
+        """
+        # Order trades by wallet, then by timestamp within each wallet
+        order = np.lexsort((arrays.ts, arrays.wallet_codes))
+        
+        w = arrays.wallet_codes[order]
+        s = arrays.sides[order]
+        a = arrays.amounts[order]
+        
+        # Consecutive trades by one wallet in opposite directions with similar amounts
+        with np.errstate(divide='ignore', invalid='ignore'):
+            amount_diff = np.abs(a[:-1] - a[1:]) / a[:-1]
+        mask = (w[:-1] == w[1:]) & (s[:-1] != s[1:]) & (amount_diff <= self.similar_amount_threshold)
+        
+        return [
+            {
+                'trade1': trades[order[i]],
+                'trade2': trades[order[i + 1]],
+                'amount_difference': float(amount_diff[i])
+            }
+            for i in np.flatnonzero(mask)
+        ]
+        
+    def _wallet_transfers(self, trades: List[Dict], arrays: TradeArrays) -> List[Tuple[str, str, int]]:
+        """
+        Token transfers between wallets as (seller, buyer, trade index)
+
+        A trade's other side is its 'counterparty' when recorded. Otherwise a
+        sell is paired with a buy of a similar amount by another wallet at the
+        same timestamp, the two sides of one fill.
+        """
+        wallets, codes, sides, amounts, ts = (
+            arrays.wallets, arrays.wallet_codes, arrays.sides, arrays.amounts, arrays.ts
+        )
+        transfers = []
+        unpaired: Dict[Any, Tuple[List[int], List[int]]] = {}
+        for i, trade in enumerate(trades):
+            side = sides[i]
+            if side > _SIDE_MAP['sell']:
+                continue  # Neither a buy nor a sell
+            wallet = wallets[codes[i]]
+            counterparty = trade.get('counterparty')
+            if counterparty:
+                if counterparty != wallet:
+                    transfers.append((wallet, counterparty, i) if side else (counterparty, wallet, i))
+            elif ts[i] == ts[i]:  # Skips NaN timestamps
+                unpaired.setdefault(ts[i], ([], []))[side].append(i)
                 
-                # Check if trades are opposite directions
-                if current_trade['side'] != next_trade['side']:
-                    # Check if amounts are similar
-                    amount_diff = abs(
-                        float(current_trade['amount']) - float(next_trade['amount'])
-                    ) / float(current_trade['amount'])
-                    
-                    if amount_diff <= self.similar_amount_threshold:
-                        wash_trades.append({
-                            'trade1': current_trade,
-                            'trade2': next_trade,
-                            'amount_difference': amount_diff
-                        })
-                        
+        threshold = self.similar_amount_threshold
+        for buys, sells in unpaired.values():
+            for i in sells:
+                for k, j in enumerate(buys):
+                    if codes[j] != codes[i] and amounts[i] and abs(amounts[j] - amounts[i]) / amounts[i] <= threshold:
+                        transfers.append((wallets[codes[i]], wallets[codes[j]], i))
+                        del buys[k]
+                        break
+        return transfers
+        
+    def _detect_reciprocal_trades(self, trades: List[Dict], arrays: TradeArrays) -> List[Dict]:
+        """
+        Detect similar amounts passed A -> B and back B -> A between colluding wallets
+        """
+        transfers = self._wallet_transfers(trades, arrays)
+        if not transfers:
+            return []
+            
+        # Value can only come back between wallets in the same strongly connected component
+        graph: Dict[str, set] = {}
+        for seller, buyer, _ in transfers:
+            graph.setdefault(seller, set()).add(buyer)
+        component_of = {}
+        for label, component in enumerate(strongly_connected_components(graph)):
+            if len(component) >= 2:
+                for wallet in component:
+                    component_of[wallet] = label
+        candidates = [t for t in transfers if component_of.get(t[0], -1) == component_of.get(t[1], -2)]
+        if not candidates:
+            return []
+        
+        # Hash-join each transfer against the latest unmatched transfer in the opposite direction
+        pending: Dict[Tuple[str, str], List[int]] = {}
+        amounts = arrays.amounts
+        wash_trades = []
+        order = np.argsort(arrays.ts[[i for _, _, i in candidates]], kind='stable')
+        for seller, buyer, i in (candidates[k] for k in order):
+            reverse = pending.get((buyer, seller))
+            if reverse:
+                j = reverse[-1]
+                amount_diff = abs(amounts[j] - amounts[i]) / amounts[j] if amounts[j] else np.inf
+                if amount_diff <= self.similar_amount_threshold:
+                    reverse.pop()
+                    wash_trades.append({
+                        'trade1': trades[j],
+                        'trade2': trades[i],
+                        'amount_difference': float(amount_diff)
+                    })
+                    continue
+            pending.setdefault((seller, buyer), []).append(i)
+            
         return wash_trades
         
-    async def analyze_supply_distribution(
+    def analyze_supply_distribution(
         self,
         initial_transfers: List[Dict],
         current_holders: List[Dict]
@@ -264,13 +454,25 @@ class SuspiciousActivityAnalyzer:
         if not transfers:
             return result
             
+        # Extract transfer columns once
+        n = len(transfers)
+        ts = np.fromiter((t['timestamp'].timestamp() for t in transfers), dtype=np.float64, count=n)
+        amounts = np.fromiter((float(t['amount']) for t in transfers), dtype=np.float64, count=n)
+        codes = {}
+        wallet_codes = np.fromiter(
+            (codes.setdefault(t['to_address'], len(codes)) for t in transfers),
+            dtype=np.int64,
+            count=n
+        )
+        
         # Sort transfers by timestamp
-        sorted_transfers = sorted(transfers, key=lambda x: x['timestamp'])
+        order = np.argsort(ts, kind='stable')
+        sorted_transfers = [transfers[i] for i in order.tolist()]
         
         # Check for suspicious batch transfers
-        batches = self._identify_transfer_batches(sorted_transfers)
+        batches = self._identify_transfer_batches(sorted_transfers, ts[order])
         if len(batches) > 1:
-            suspicious_batches = self._analyze_batch_patterns(batches)
+            suspicious_batches = self._analyze_batch_patterns(batches, amounts[order])
             if suspicious_batches:
                 result['is_suspicious'] = True
                 result['reasons'].append(
@@ -279,17 +481,10 @@ class SuspiciousActivityAnalyzer:
                 result['metrics']['suspicious_batch_count'] = len(suspicious_batches)
                 
         # Check for single entity control
-        wallet_amounts = defaultdict(float)
-        total_supply = 0
-        
-        for transfer in transfers:
-            wallet = transfer['to_address']
-            amount = float(transfer['amount'])
-            wallet_amounts[wallet] += amount
-            total_supply += amount
+        total_supply = float(amounts.sum())
             
         if total_supply > 0:
-            max_wallet_amount = max(wallet_amounts.values())
+            max_wallet_amount = float(np.bincount(wallet_codes, weights=amounts).max())
             max_supply_ratio = max_wallet_amount / total_supply
             
             result['metrics']['max_wallet_supply_ratio'] = max_supply_ratio
@@ -302,39 +497,53 @@ class SuspiciousActivityAnalyzer:
                 
         return result
         
-    def _identify_transfer_batches(self, transfers: List[Dict]) -> List[List[Dict]]:
+    def _identify_transfer_batches(
+        self,
+        transfers: List[Dict],
+        ts: Optional[np.ndarray] = None
+    ) -> List[List[Dict]]:
         """
-        Group transfers into batches based on timing
+        Group time-ordered transfers into batches based on timing
         """
-        batches = []
-        current_batch = []
-        
-        for transfer in transfers:
-            if not current_batch:
-                current_batch.append(transfer)
-                continue
-                
-            time_diff = (
-                transfer['timestamp'] - current_batch[-1]['timestamp']
-            ).total_seconds()
-            
-            if time_diff <= self.batch_time_threshold:
-                current_batch.append(transfer)
-            else:
-                batches.append(current_batch)
-                current_batch = [transfer]
-                
-        if current_batch:
-            batches.append(current_batch)
+        if not transfers:
+            return []
+        if ts is None:
+            ts = _timestamp_column([t['timestamp'] for t in transfers])
             
-        return batches
+        # A gap longer than the batch threshold starts a new batch
+        boundaries = (np.flatnonzero(np.diff(ts) > self.batch_time_threshold) + 1).tolist()
+        return [
+            transfers[start:end]
+            for start, end in zip([0] + boundaries, boundaries + [len(transfers)])
+        ]
         
-    def _analyze_batch_patterns(self, batches: List[List[Dict]]) -> List[Dict]:
+    def _analyze_batch_patterns(
+        self,
+        batches: List[List[Dict]],
+        amounts: Optional[np.ndarray] = None
+    ) -> List[Dict]:
         """
-        Analyze transfer batches for suspicious patterns
+        Analyze non-empty transfer batches for suspicious patterns
         """
+        if not batches:
+            return []
+        counts = np.fromiter((len(batch) for batch in batches), dtype=np.int64, count=len(batches))
+        if amounts is None:
+            amounts = np.fromiter(
+                (float(t['amount']) for batch in batches for t in batch),
+                dtype=np.float64,
+                count=int(counts.sum())
+            )
+            
+        # Per-batch mean and standard deviation of amounts in two vectorized passes
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        means = np.add.reduceat(amounts, starts) / counts
+        deviations = amounts - np.repeat(means, counts)
+        stds = np.sqrt(np.add.reduceat(deviations * deviations, starts) / counts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            uniform = (means != 0) & (stds / means < self.similar_amount_threshold)
+            
         suspicious_batches = []
-        
         for i, batch in enumerate(batches):
             batch_analysis = {
                 'batch_index': i,
@@ -342,18 +551,13 @@ class SuspiciousActivityAnalyzer:
             }
             
             # Check for similar amounts in batch
-            amounts = [float(t['amount']) for t in batch]
-            amount_std = np.std(amounts)
-            amount_mean = np.mean(amounts)
-            
-            if amount_std / amount_mean < self.similar_amount_threshold:
+            if uniform[i]:
                 batch_analysis['suspicious_patterns'].append(
                     "Uniform distribution of amounts"
                 )
                 
             # Check for sequential wallet patterns
-            wallets = [t['to_address'] for t in batch]
-            if len(set(wallets)) == len(wallets) and len(wallets) > 5:
+            if len(batch) > 5 and _all_distinct([t['to_address'] for t in batch]):
                 batch_analysis['suspicious_patterns'].append(
                     "Sequential different wallets"
                 )
@@ -376,13 +580,13 @@ class SuspiciousActivityAnalyzer:
         if not holders:
             return result
             
-        total_supply = sum(float(h['balance']) for h in holders)
+        # Total, largest balance and Gini coefficient in one pass
+        total_supply, max_balance, gini = _sorted_supply_stats(
+            [float(h['balance']) for h in holders]
+        )
         
         if total_supply > 0:
-            # Calculate Gini coefficient for supply distribution
-            gini = self._calculate_gini_coefficient(
-                [float(h['balance']) for h in holders]
-            )
+            # Gini coefficient for supply distribution
             result['metrics']['gini_coefficient'] = gini
             
             if gini > 0.9:  # Extremely unequal distribution
@@ -392,7 +596,6 @@ class SuspiciousActivityAnalyzer:
                 )
                 
             # Check for suspicious holder patterns
-            max_balance = max(float(h['balance']) for h in holders)
             max_supply_ratio = max_balance / total_supply
             
             result['metrics']['max_holder_supply_ratio'] = max_supply_ratio
@@ -405,21 +608,16 @@ class SuspiciousActivityAnalyzer:
                 
         return result
         
-    def _calculate_gini_coefficient(self, values: List[float]) -> float:
+    def _calculate_gini_coefficient(self, values: Union[List[float], np.ndarray]) -> float:
         """
         Calculate Gini coefficient for measuring inequality
         """
-        sorted_values = sorted(values)
-        n = len(sorted_values)
-        if n == 0:
+        if len(values) == 0:
             return 0
             
-        index = np.arange(1, n + 1)
-        return (
-            (2 * np.sum(index * sorted_values)) / (n * np.sum(sorted_values))
-        ) - ((n + 1) / n)
+        return float(_sorted_supply_stats(values)[2])
         
-    async def get_market_cap_analysis(
+    def get_market_cap_analysis(
         self,
         total_supply: float,
         price: float,
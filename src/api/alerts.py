@@ -1,9 +1,15 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional
-import json
+from typing import Dict, List, Optional, Set
+import logging
+import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime
+from src.utils.json_utils import dumps, loads, read_json
+from src.utils.write_behind import WriteBehind
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -22,54 +28,157 @@ class Alert(BaseModel):
     is_active: bool = True
 
 class AlertManager:
-    def __init__(self):
-        self.data_dir = Path(__file__).parent.parent.parent / "data"
+    def __init__(self, data_dir: Optional[Path] = None):
+        self.data_dir = data_dir or Path(__file__).parent.parent.parent / "data"
+        self.data_dir.mkdir(exist_ok=True)
         self.alerts_file = self.data_dir / "alerts.json"
-        self._ensure_file_exists()
+        self.db_file = self.data_dir / "alerts.db"
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_file, isolation_level=None, check_same_thread=False)
+        self._ensure_schema()
+        
+        # Alerts are served from memory; changes are written behind
+        self._cache: Dict[str, Alert] = {
+            alert.id: alert for alert in self._load_alerts()
+        }
+        self._dirty_ids: Set[str] = set()
+        self._writer = WriteBehind(
+            self._take_changes,
+            lambda changes: self._write_alerts(*changes),
+            delay=0.1,
+            name="alerts"
+        )
+        
+    def _ensure_schema(self):
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS alerts ("
+                "id TEXT PRIMARY KEY, token_address TEXT, condition_json TEXT, "
+                "notification_type TEXT, notification_target TEXT, created_at TEXT, "
+                "is_active INTEGER)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_alerts_active ON alerts(is_active)")
+            
+            # Import alerts saved by the JSON-backed version once; user_version
+            # records the import so deleted alerts don't come back. Databases
+            # created before the marker count as imported once they hold rows.
+            imported = (
+                self._db.execute("PRAGMA user_version").fetchone()[0] >= 1
+                or self._db.execute("SELECT 1 FROM alerts LIMIT 1").fetchone() is not None
+            )
+            if not imported:
+                self._db.execute("BEGIN")
+                if self.alerts_file.exists():
+                    data = read_json(self.alerts_file)
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO alerts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [self._to_row(Alert(**a)) for a in data.get("alerts", [])]
+                    )
+                self._db.execute("PRAGMA user_version = 1")
+                self._db.execute("COMMIT")
+                
+    @staticmethod
+    def _to_row(alert: Alert) -> tuple:
+        return (
+            alert.id,
+            alert.token_address,
+            dumps(alert.condition.dict()).decode(),
+            alert.notification_type,
+            alert.notification_target,
+            alert.created_at.isoformat(),
+            int(alert.is_active)
+        )
+        
+    @staticmethod
+    def _from_row(row: tuple) -> Alert:
+        alert_id, token_address, condition_json, notification_type, notification_target, created_at, is_active = row
+        return Alert(
+            id=alert_id,
+            token_address=token_address,
+            condition=AlertCondition(**loads(condition_json)),
+            notification_type=notification_type,
+            notification_target=notification_target,
+            created_at=created_at,
+            is_active=bool(is_active)
+        )
+            
+    def _load_alerts(self) -> List[Alert]:
+        with self._lock:
+            rows = self._db.execute("SELECT * FROM alerts ORDER BY rowid").fetchall()
+        return [self._from_row(row) for row in rows]
         
-    def _ensure_file_exists(self):
-        if not self.alerts_file.exists():
-            self.alerts_file.write_text('{"alerts": []}')
+    def _write_alerts(self, upserts: List[tuple], deletes: List[str]):
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR REPLACE INTO alerts VALUES (?, ?, ?, ?, ?, ?, ?)", upserts)
+            self._db.executemany("DELETE FROM alerts WHERE id = ?", [(alert_id,) for alert_id in deletes])
+            self._db.execute("COMMIT")
+            
+    def _take_changes(self) -> tuple:
+        """Collect rows to write for the alerts changed since the last flush"""
+        upserts = [self._to_row(self._cache[i]) for i in self._dirty_ids if i in self._cache]
+        deletes = [i for i in self._dirty_ids if i not in self._cache]
+        self._dirty_ids.clear()
+        return upserts, deletes
+        
+    def _mark_dirty(self, alert_id: str):
+        self._dirty_ids.add(alert_id)
+        self._writer.mark_dirty()
+        
+    async def aclose(self):
+        """Stop the background writer and save pending changes"""
+        await self._writer.aclose()
             
     def get_alerts(self) -> List[Alert]:
-        data = json.loads(self.alerts_file.read_text())
-        return [Alert(**a) for a in data["alerts"]]
+        return list(self._cache.values())
         
     def add_alert(self, alert: Alert):
-        data = json.loads(self.alerts_file.read_text())
-        data["alerts"].append(alert.dict())
-        self.alerts_file.write_text(json.dumps(data, indent=2))
+        # Re-adding an id moves it to the end, like the table's INSERT OR REPLACE
+        self._cache.pop(alert.id, None)
+        self._cache[alert.id] = alert
+        self._mark_dirty(alert.id)
         
     def remove_alert(self, alert_id: str):
-        data = json.loads(self.alerts_file.read_text())
-        data["alerts"] = [a for a in data["alerts"] if a["id"] != alert_id]
-        self.alerts_file.write_text(json.dumps(data, indent=2))
+        if self._cache.pop(alert_id, None) is not None:
+            self._mark_dirty(alert_id)
         
     def toggle_alert(self, alert_id: str):
-        data = json.loads(self.alerts_file.read_text())
-        for alert in data["alerts"]:
-            if alert["id"] == alert_id:
-                alert["is_active"] = not alert["is_active"]
-                break
-        self.alerts_file.write_text(json.dumps(data, indent=2))
+        alert = self._cache.get(alert_id)
+        if alert is not None:
+            alert.is_active = not alert.is_active
+            self._mark_dirty(alert_id)
+
+_alert_manager: Optional[AlertManager] = None
+
+def get_alert_manager() -> AlertManager:
+    """Get the process-wide alert manager, opening its database on first use"""
+    global _alert_manager
+    if _alert_manager is None:
+        _alert_manager = AlertManager()
+    return _alert_manager
 
-alert_manager = AlertManager()
+async def close_alert_manager():
+    """Save pending alert changes if the alert manager was opened"""
+    if _alert_manager is not None:
+        await _alert_manager.aclose()
 
 @router.get("/alerts", response_model=List[Alert])
 async def get_alerts():
-    return alert_manager.get_alerts()
+    return get_alert_manager().get_alerts()
 
 @router.post("/alerts", response_model=Alert)
 async def create_alert(alert: Alert):
-    alert_manager.add_alert(alert)
+    get_alert_manager().add_alert(alert)
     return alert
 
 @router.delete("/alerts/{alert_id}")
 async def delete_alert(alert_id: str):
-    alert_manager.remove_alert(alert_id)
+    get_alert_manager().remove_alert(alert_id)
     return {"status": "success"}
 
 @router.post("/alerts/{alert_id}/toggle")
 async def toggle_alert(alert_id: str):
-    alert_manager.toggle_alert(alert_id)
+    get_alert_manager().toggle_alert(alert_id)
     return {"status": "success"}
@@ -1,12 +1,11 @@
 """Dashboard API endpoints"""
 from fastapi import FastAPI, Request, HTTPException, WebSocket, WebSocketDisconnect, Depends
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-import json
 import os
 from datetime import datetime
 import plotly.graph_objects as go
@@ -23,6 +22,8 @@ from contextlib import asynccontextmanager
 from src.models.token_analysis import TokenAnalysis
 from src.monitor.token_monitor import TokenMonitor
 from src.analysis.analysis_tools import AnalysisTools
+from src.caching.ttl_cache import TTLCache
+from src.utils.json_utils import dumps
 from src.reporting.report_generator import ReportGenerator
 from src.security.security_manager import SecurityManager, rate_limit
 from src.monitoring.performance_manager import PerformanceManager
@@ -33,7 +34,7 @@ from src.collectors.background_tasks import init_background_tasks
 
 # API routers
 from src.api.wallet import router as wallet_router
-from src.api.alerts import router as alerts_router
+from src.api.alerts import close_alert_manager, router as alerts_router
 from src.api.health import router as health_router
 
 # Configure logging
@@ -43,7 +44,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Solana Token Monitor",
     description="Dashboard for monitoring Solana token activity",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -75,6 +77,17 @@ report_generator = ReportGenerator()
 # WebSocket connections
 active_connections: Set[WebSocket] = set()
 
+# Seconds a token analysis is reused for repeat views of the same token
+ANALYSIS_TTL = 15
+_analysis_cache = TTLCache(maxsize=1024, ttl=ANALYSIS_TTL)
+
+async def _cached_analyze(token_address: str) -> Dict:
+    """Get a token analysis, running it once for concurrent misses"""
+    return await _analysis_cache.get_or_compute(
+        token_address,
+        lambda: analysis_tools.analyze_token(token_address)
+    )
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle management for the API"""
@@ -98,6 +111,7 @@ async def lifespan(app: FastAPI):
                 pass
                 
         await token_monitor.close()
+        await close_alert_manager()
         await event_manager.close()
         await db_manager.close()
         
@@ -133,7 +147,7 @@ async def error_handler(request: Request, call_next):
         raise
     except Exception as e:
         logger.error(f"Unhandled error: {str(e)}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={"error": "Internal server error", "detail": str(e)}
         )
@@ -157,16 +171,26 @@ async def websocket_endpoint(websocket: WebSocket):
         logger.error(f"WebSocket error: {str(e)}")
         
     finally:
-        active_connections.remove(websocket)
+        active_connections.discard(websocket)
 
 async def broadcast_update(message: Dict):
     """Broadcast update to all connected clients"""
-    for connection in active_connections:
-        try:
-            await connection.send_json(message)
-        except Exception as e:
-            logger.error(f"Error broadcasting to client: {str(e)}")
-            active_connections.remove(connection)
+    # A token update makes its cached analysis stale
+    token_address = message.get("token_address")
+    if token_address:
+        _analysis_cache.pop(token_address)
+        
+    # Serialize once and send to every client concurrently
+    payload = dumps(message).decode()
+    connections = list(active_connections)
+    results = await asyncio.gather(
+        *[connection.send_text(payload) for connection in connections],
+        return_exceptions=True
+    )
+    for connection, result in zip(connections, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error broadcasting to client: {str(result)}")
+            active_connections.discard(connection)
 
 @app.get("/")
 async def root(request: Request):
@@ -202,7 +226,7 @@ async def dashboard(request: Request):
 async def get_token_analysis(token_address: str):
     """Get token analysis"""
     try:
-        analysis = await analysis_tools.analyze_token(token_address)
+        analysis = await _cached_analyze(token_address)
         return analysis
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
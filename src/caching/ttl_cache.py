@@ -0,0 +1,81 @@
+"""In-process LRU cache with per-entry expiry"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+class TTLCache:
+    """Bounded LRU mapping whose entries expire ttl seconds after being set"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Get a live entry, refreshing its LRU position"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if time.monotonic() >= expires_at:
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry, evicting the least recently used one when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """Get a live entry, or compute and store it once for concurrent misses
+
+        Callers missing the same key wait for a single ``factory()`` call.
+        None results are not stored, so failed lookups are retried.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                value = self.get(key)
+                if value is None:
+                    value = await factory()
+                    if value is not None:
+                        self.set(key, value, ttl=ttl)
+                return value
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Remove an entry and return its value"""
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+_MISSING = object()
@@ -155,9 +155,16 @@ class TokenCollector:
         except Exception as e:
             logger.error(f"Error updating data: {str(e)}")
 
+    async def close(self):
+        """Save pending analyzer state"""
+        await self.analyzer.aclose()
+
 async def start_collector():
     """Start the token collector"""
     collector = TokenCollector()
-    while True:
-        await collector.update_data()
-        await asyncio.sleep(60)  # Update every minute
+    try:
+        while True:
+            await collector.update_data()
+            await asyncio.sleep(60)  # Update every minute
+    finally:
+        await collector.close()
@@ -103,6 +103,9 @@ class SystemIntegrator:
 
             self.background_tasks.clear()
             self.is_running = False
+            
+            # Save state the analyzers still hold in memory
+            await self.token_analyzer.aclose()
 
             # Clear event handlers
             event_manager.clear_handlers()
@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 import asyncio
 import time
 from ..error_handling.api_errors import APIError, APIKeyError, handle_api_error
+from ..utils.json_utils import loads as json_loads
 from ..config import (
     API_RATE_LIMIT,
     API_RATE_LIMIT_WINDOW,
@@ -43,6 +44,7 @@ class BaseAPI:
         """Initialize API session"""
         if not self.session:
             self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, keepalive_timeout=30),
                 headers={"Authorization": f"Bearer {self.config.api_key}"},
                 timeout=aiohttp.ClientTimeout(
                     total=self.config.timeout["total"],
@@ -99,7 +101,7 @@ class BaseAPI:
                         continue
                         
                     response.raise_for_status()
-                    return await response.json()
+                    return await response.json(loads=json_loads)
                     
             except aiohttp.ClientError as e:
                 if retries < self.config.max_retries - 1 and await handle_api_error(e):
@@ -1,6 +1,6 @@
 import aiohttp
 import logging
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 import os
 from datetime import datetime, timedelta
 import json
@@ -22,6 +22,9 @@ from ..test.mock_data import (
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on the pages one paginated scan fetches
+MAX_PAGES = 100
+
 class HeliusAPI(BaseAPI):
     """Helius API integration"""
     
@@ -61,6 +64,67 @@ class HeliusAPI(BaseAPI):
         endpoint = f"/token-holders/{token_address}"
         return await self._make_request("GET", endpoint)
         
+    async def iter_token_holders(self, token_address: str, page_size: int = 1000) -> AsyncIterator[List[Dict]]:
+        """Yield token holders one page at a time"""
+        if self.use_mock:
+            yield get_mock_holders(token_address)
+            return
+            
+        async for page in self._iter_offset_pages(f"/token-holders/{token_address}", page_size):
+            yield page
+        
+    async def iter_wallet_history(self, address: str, page_size: int = 100) -> AsyncIterator[List[Dict]]:
+        """Yield a wallet's parsed transactions one page at a time, newest first"""
+        if self.use_mock:
+            yield get_mock_transactions(address)
+            return
+            
+        endpoint = f"/addresses/{address}/transactions"
+        params = {"limit": page_size}
+        while True:
+            page = await self._make_request("GET", endpoint, params=params)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            params = {"limit": page_size, "before": page[-1].get("signature")}
+            
+    async def iter_token_transfers(self, token_address: str, page_size: int = 1000) -> AsyncIterator[List[Dict]]:
+        """Yield token transfers one page at a time"""
+        if self.use_mock:
+            yield get_mock_transactions(token_address)
+            return
+            
+        async for page in self._iter_offset_pages(f"/token-transfers/{token_address}", page_size):
+            yield page
+            
+    async def _iter_offset_pages(self, endpoint: str, page_size: int, max_pages: int = MAX_PAGES) -> AsyncIterator[List[Dict]]:
+        """Yield the items of an offset-paginated endpoint one page at a time
+
+        Stops at an empty or short page, after max_pages pages, or at a page
+        that starts and ends like the previous one, as returned by an endpoint
+        that ignores the offset.
+        """
+        previous = None
+        for page_number in range(max_pages):
+            page = await self._make_request(
+                "GET",
+                endpoint,
+                params={"limit": page_size, "offset": page_number * page_size}
+            )
+            if not page:
+                return
+            bounds = (page[0], page[-1])
+            if bounds == previous:
+                logger.warning(f"{endpoint} repeated a page, stopping pagination")
+                return
+            previous = bounds
+            yield page
+            if len(page) < page_size:
+                return
+        logger.warning(f"Stopped paginating {endpoint} after {max_pages} pages")
+            
     async def get_token_events(self, token_address: str, start_time: Optional[datetime] = None) -> List[Dict]:
         """Get token events for a given token"""
         if self.use_mock:
@@ -161,3 +225,12 @@ class HeliusAPI(BaseAPI):
         except Exception as e:
             logger.error(f"Error in Solscan fallback for deployer: {str(e)}")
             return None
+
+_shared_client: Optional[HeliusAPI] = None
+
+def get_helius() -> HeliusAPI:
+    """Get the process-wide Helius client, creating it on first use"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = HeliusAPI()
+    return _shared_client
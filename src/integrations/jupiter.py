@@ -1,6 +1,7 @@
 import aiohttp
+import asyncio
 import logging
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 import os
 import json
 from urllib.parse import urljoin
@@ -11,9 +12,13 @@ from ..error_handling.api_errors import (
     handle_api_error,
     should_retry
 )
+from ..utils.json_utils import loads as json_loads
 
 logger = logging.getLogger(__name__)
 
+# Maximum token ids per batched price request
+PRICE_BATCH_SIZE = 100
+
 class JupiterAPI:
     def __init__(self):
         self.api_key = os.getenv("JUPITER_API_KEY")
@@ -30,6 +35,8 @@ class JupiterAPI:
         if not self.session:
             # Use a DNS resolver that doesn't rely on the system's DNS
             connector = aiohttp.TCPConnector(
+                limit=50,
+                keepalive_timeout=30,  # Keep pooled connections warm between calls
                 ttl_dns_cache=300,  # Cache DNS results for 5 minutes
                 use_dns_cache=True,
                 ssl=False  # Disable SSL verification if needed
@@ -64,7 +71,7 @@ class JupiterAPI:
                 headers={"Authorization": f"Bearer {self.api_key}"}
             ) as response:
                 try:
-                    data = await response.json()
+                    data = await response.json(loads=json_loads)
                 except Exception as e:
                     logger.error(f"Error parsing Jupiter response: {str(e)}")
                     return {"success": False, "error": "invalid_response"}
@@ -151,6 +158,34 @@ class JupiterAPI:
                 "error": str(e)
             }
             
+    async def get_token_prices(self, token_addresses: Iterable[str]) -> Dict[str, Dict]:
+        """Get price information for several tokens, keyed by token address"""
+        tokens = list(dict.fromkeys(token_addresses))
+        valid = [t for t in tokens if t and len(t) >= 32]
+        batches = [valid[i:i + PRICE_BATCH_SIZE] for i in range(0, len(valid), PRICE_BATCH_SIZE)]
+        results = await asyncio.gather(*[
+            self._make_request("price", {"ids": ",".join(batch), "vsToken": "USDC"})
+            for batch in batches
+        ])
+        
+        prices = {}
+        for result in results:
+            if not result.get("success"):
+                continue
+            for token, data in result["data"].get("data", {}).items():
+                prices[token] = {
+                    "price": float(data.get("price", 0)),
+                    "price_change_24h": float(data.get("priceChange24h", 0)),
+                    "error": None
+                }
+                
+        # Tokens missing from the batched response fall back to single lookups
+        missing = [t for t in tokens if t not in prices]
+        if missing:
+            singles = await asyncio.gather(*[self.get_token_price(t) for t in missing])
+            prices.update(zip(missing, singles))
+        return prices
+        
     async def _get_alternative_price(self, token_address: str) -> Dict:
         """Get price from alternative Jupiter endpoint"""
         try:
@@ -185,3 +220,12 @@ class JupiterAPI:
                 "price_change_24h": 0,
                 "error": "alternative_price_error"
             }
+
+_shared_client: Optional[JupiterAPI] = None
+
+def get_jupiter() -> JupiterAPI:
+    """Get the process-wide Jupiter client, creating it on first use"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = JupiterAPI()
+    return _shared_client
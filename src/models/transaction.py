@@ -0,0 +1,43 @@
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import msgspec
+
+logger = logging.getLogger(__name__)
+
+class Transaction(msgspec.Struct, gc=False):
+    """Token transaction with numeric fields coerced once on load"""
+    amount: float = 0.0
+    price: float = 0.0
+    price_before: float = 0.0
+    price_after: float = 0.0
+    is_buy: bool = False
+    # ISO 8601 strings and epoch seconds are both accepted
+    timestamp: Optional[datetime] = None
+    signature: Optional[str] = None
+    sender: Optional[str] = msgspec.field(name="from", default=None)
+    receiver: Optional[str] = msgspec.field(name="to", default=None)
+    from_address: Optional[str] = None
+    to_address: Optional[str] = None
+
+def to_transactions(raw: Iterable[Dict]) -> List[Transaction]:
+    """Convert raw transaction dicts, ignoring unknown fields
+
+    Rows that can't be converted, such as ones with a malformed timestamp,
+    are logged and dropped.
+    """
+    raw = list(raw)
+    try:
+        return msgspec.convert(raw, List[Transaction], strict=False)
+    except msgspec.ValidationError:
+        pass
+
+    # Convert row by row to find the bad rows
+    transactions = []
+    for row in raw:
+        try:
+            transactions.append(msgspec.convert(row, Transaction, strict=False))
+        except msgspec.ValidationError as e:
+            signature = row.get("signature") if isinstance(row, dict) else None
+            logger.warning(f"Skipping transaction {signature}: {str(e)}")
+    return transactions
@@ -44,6 +44,7 @@ class TokenMonitor:
     async def stop(self):
         """Stop monitoring"""
         self.is_running = False
+        await self.token_analyzer.aclose()
 
     async def monitor_new_tokens(self):
         """Monitor pump.fun for new token launches"""
@@ -115,6 +115,12 @@ class TokenMonitor:
         else:
             print(f"Token confidence score too low: {confidence_score:.1f}")
 
+    async def close(self) -> None:
+        """
+        Release resources held by the analyzers
+        """
+        await self.confidence_analyzer.close()
+
     def _check_deployer_success_rate(self, deployer_data: Dict) -> bool:
         """
         Check if deployer meets minimum success rate requirements
@@ -149,7 +155,10 @@ async def main():
     print("Starting pump.fun token monitor...")
     print("Monitoring for new tokens with market cap > $30,000")
     
-    await monitor.pumpfun_monitor.monitor_new_launches(monitor.handle_new_token)
+    try:
+        await monitor.pumpfun_monitor.monitor_new_launches(monitor.handle_new_token)
+    finally:
+        await monitor.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,51 @@
+"""Graph algorithms over adjacency mappings"""
+from typing import Dict, Hashable, Iterable, List
+
+def strongly_connected_components(graph: Dict[Hashable, Iterable[Hashable]]) -> List[List[Hashable]]:
+    """Find strongly connected components with an iterative Tarjan's algorithm
+
+    ``graph`` maps each node to its successors; nodes that only appear as
+    successors are treated as having no outgoing edges. Runs in O(V + E).
+    """
+    index: Dict[Hashable, int] = {}
+    low: Dict[Hashable, int] = {}
+    on_stack = set()
+    stack: List[Hashable] = []
+    components: List[List[Hashable]] = []
+
+    for root in graph:
+        if root in index:
+            continue
+
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+
+        while work:
+            node, successors = work[-1]
+            for succ in successors:
+                if succ not in index:
+                    index[succ] = low[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(graph.get(succ, ()))))
+                    break
+                if succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
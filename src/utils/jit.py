@@ -0,0 +1,25 @@
+"""Optional Numba JIT compilation for numeric hot paths"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Try importing numba, fall back to running the plain Python functions
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba package not available. JIT-compiled kernels will run as plain Python.")
+
+def njit(*args, **kwargs):
+    """Compile a function with numba.njit when available, otherwise return it unchanged
+
+    Supports both ``@njit`` and ``@njit(cache=True)`` forms.
+    """
+    if args and callable(args[0]) and len(args) == 1 and not kwargs:
+        func = args[0]
+        return _numba_njit(func) if NUMBA_AVAILABLE else func
+
+    def decorator(func):
+        return _numba_njit(*args, **kwargs)(func) if NUMBA_AVAILABLE else func
+    return decorator
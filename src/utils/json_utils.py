@@ -0,0 +1,66 @@
+"""JSON serialization helpers backed by orjson when available"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Union
+
+logger = logging.getLogger(__name__)
+
+# Try importing orjson, fall back to the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson package not available. Falling back to stdlib json.")
+
+# Try importing ijson, fall back to loading large files in one go
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+    logger.warning("ijson package not available. Large JSON files will be loaded in one go.")
+
+# Files larger than this are stream-parsed when ijson is available
+STREAM_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON"""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode("utf-8")
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Read and parse a JSON file"""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+def write_json(path: Union[str, Path], obj: Any, indent: bool = True) -> None:
+    """Serialize an object and write it to a JSON file"""
+    write_bytes_atomic(path, dumps(obj, indent=indent))
+
+def write_bytes_atomic(path: Union[str, Path], data: bytes) -> None:
+    """Write a file via a temporary sibling so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def read_json_mapping(path: Union[str, Path], threshold: int = STREAM_THRESHOLD_BYTES) -> Dict[str, Any]:
+    """Read a JSON object file, stream-parsing its top-level items when it is large"""
+    if not IJSON_AVAILABLE or os.path.getsize(path) <= threshold:
+        return read_json(path)
+
+    with open(path, "rb") as f:
+        return {key: value for key, value in ijson.kvitems(f, "", use_float=True)}
@@ -0,0 +1,50 @@
+"""Async token-bucket rate limiter"""
+import asyncio
+import time
+
+class AsyncRateLimiter:
+    """Token-bucket limiter allowing max_rate acquisitions per time_period seconds
+
+    Usage::
+
+        limiter = AsyncRateLimiter(50, 900)
+        async with limiter:
+            ...
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._rate_per_sec = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add tokens accrued since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.max_rate, self._tokens + elapsed * self._rate_per_sec)
+
+    def has_capacity(self, amount: float = 1) -> bool:
+        """Check whether amount tokens are available without waiting"""
+        self._refill()
+        return self._tokens >= amount
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until amount tokens are available and consume them"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self._rate_per_sec)
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
@@ -0,0 +1,107 @@
+"""Write-behind persistence for state kept in memory"""
+import asyncio
+import atexit
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class WriteBehind:
+    """Coalesce changes to in-memory state into background saves
+
+    ``snapshot`` runs on the event loop and captures what to save, and
+    ``write`` stores that snapshot from a worker thread. A save runs
+    ``delay`` seconds after a change, so bursts of changes share one write.
+    Pending changes are saved by ``aclose``, when the writer task is
+    cancelled at loop shutdown, and at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        snapshot: Callable[[], Any],
+        write: Callable[[Any], None],
+        delay: float = 1.0,
+        name: str = "data"
+    ):
+        self._snapshot = snapshot
+        self._write = write
+        self.delay = delay
+        self.name = name
+        self._unsaved = False
+        self._dirty: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        # Serializes the writer thread with synchronous flushes
+        self._io_lock = threading.Lock()
+        _writers.add(self)
+
+    @property
+    def unsaved(self) -> bool:
+        """Whether there are changes that have not been saved yet"""
+        return self._unsaved
+
+    def mark_dirty(self) -> None:
+        """Record a change and make sure a save is scheduled"""
+        self._unsaved = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to write behind on, write now
+            self.flush()
+            return
+        if self._task is None or self._task.done():
+            self._dirty = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        self._dirty.set()
+
+    def _save(self, payload: Any) -> None:
+        with self._io_lock:
+            self._write(payload)
+
+    async def _run(self):
+        try:
+            while True:
+                await self._dirty.wait()
+                self._dirty.clear()
+                await asyncio.sleep(self.delay)
+                if not self._unsaved:
+                    continue
+                self._unsaved = False
+                try:
+                    await asyncio.to_thread(self._save, self._snapshot())
+                except Exception as e:
+                    self._unsaved = True
+                    logger.error(f"Error saving {self.name}: {str(e)}")
+        except asyncio.CancelledError:
+            self.flush()
+            raise
+
+    def flush(self) -> None:
+        """Save pending changes synchronously"""
+        if not self._unsaved:
+            return
+        self._unsaved = False
+        try:
+            self._save(self._snapshot())
+        except Exception as e:
+            logger.error(f"Error saving {self.name}: {str(e)}")
+
+    async def aclose(self) -> None:
+        """Stop the background writer and save pending changes"""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.flush()
+
+_writers: "weakref.WeakSet[WriteBehind]" = weakref.WeakSet()
+
+@atexit.register
+def _flush_at_exit() -> None:
+    """Save whatever live writers still hold when the interpreter exits"""
+    for writer in list(_writers):
+        writer.flush()
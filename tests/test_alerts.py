@@ -0,0 +1,37 @@
+"""Tests for the SQLite-backed alert manager"""
+from src.api.alerts import AlertManager
+from src.utils.json_utils import write_json
+
+LEGACY_ALERTS = {
+    "alerts": [
+        {
+            "id": f"alert{i}",
+            "token_address": "token",
+            "condition": {"type": "price", "operator": ">", "value": 1.0},
+            "notification_type": "discord",
+            "notification_target": "webhook",
+            "created_at": "2024-01-01T00:00:00"
+        }
+        for i in range(2)
+    ]
+}
+
+def test_legacy_alerts_imported_once(tmp_path):
+    """Test that alerts.json is imported on first open and never again"""
+    write_json(tmp_path / "alerts.json", LEGACY_ALERTS)
+    manager = AlertManager(data_dir=tmp_path)
+    assert [a.id for a in manager.get_alerts()] == ["alert0", "alert1"]
+
+    # Deleting every imported alert must not bring them back on reopen
+    manager.remove_alert("alert0")
+    manager.remove_alert("alert1")
+    assert AlertManager(data_dir=tmp_path).get_alerts() == []
+
+def test_changes_persist(tmp_path):
+    """Test that alert changes are visible after reopening"""
+    write_json(tmp_path / "alerts.json", LEGACY_ALERTS)
+    manager = AlertManager(data_dir=tmp_path)
+    manager.toggle_alert("alert1")
+
+    alerts = AlertManager(data_dir=tmp_path).get_alerts()
+    assert [(a.id, a.is_active) for a in alerts] == [("alert0", True), ("alert1", False)]
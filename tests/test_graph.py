@@ -0,0 +1,25 @@
+"""Tests for graph algorithms"""
+import pytest
+from src.utils.graph import strongly_connected_components
+
+def _normalize(components):
+    return sorted(sorted(c) for c in components)
+
+def test_cycle_and_tail():
+    """Test that a cycle forms one component and its tail stays separate"""
+    graph = {"a": ["b"], "b": ["c"], "c": ["a", "d"], "d": []}
+    assert _normalize(strongly_connected_components(graph)) == [["a", "b", "c"], ["d"]]
+
+def test_successor_only_nodes():
+    """Test nodes that never appear as keys"""
+    graph = {"a": ["b"], "c": ["a"]}
+    assert _normalize(strongly_connected_components(graph)) == [["a"], ["b"], ["c"]]
+
+def test_long_chain_does_not_recurse():
+    """Test that deep graphs don't hit the recursion limit"""
+    n = 10000
+    graph = {i: [i + 1] for i in range(n)}
+    graph[n] = [0]
+    components = strongly_connected_components(graph)
+    assert len(components) == 1
+    assert len(components[0]) == n + 1
@@ -0,0 +1,73 @@
+"""Tests for Helius pagination"""
+import pytest
+from src.integrations.helius import HeliusAPI
+
+class FakeEndpoint:
+    """Serves fixed items for offset pagination, optionally ignoring the offset"""
+
+    def __init__(self, items, ignore_offset=False):
+        self.items = items
+        self.ignore_offset = ignore_offset
+        self.calls = 0
+
+    async def __call__(self, method, endpoint, params=None):
+        self.calls += 1
+        offset = 0 if self.ignore_offset else params["offset"]
+        return self.items[offset:offset + params["limit"]]
+
+def _client(fake):
+    client = HeliusAPI(api_key="test")
+    client.use_mock = False
+    client._make_request = fake
+    return client
+
+async def _collect(pages):
+    return [item async for page in pages for item in page]
+
+@pytest.mark.asyncio
+async def test_pages_until_short_page():
+    """Test that pagination stops after a short page"""
+    fake = FakeEndpoint([{"address": str(i)} for i in range(5)])
+    holders = await _collect(_client(fake).iter_token_holders("token", page_size=2))
+    assert [h["address"] for h in holders] == ["0", "1", "2", "3", "4"]
+    assert fake.calls == 3
+
+@pytest.mark.asyncio
+async def test_exact_multiple_of_page_size():
+    """Test that a full last page ends at the following empty page"""
+    fake = FakeEndpoint([{"address": str(i)} for i in range(4)])
+    holders = await _collect(_client(fake).iter_token_holders("token", page_size=2))
+    assert len(holders) == 4
+    assert fake.calls == 3
+
+@pytest.mark.asyncio
+async def test_endpoint_ignoring_offset():
+    """Test that a repeated page stops pagination"""
+    fake = FakeEndpoint([{"address": str(i)} for i in range(2)], ignore_offset=True)
+    holders = await _collect(_client(fake).iter_token_holders("token", page_size=2))
+    assert len(holders) == 2
+    assert fake.calls == 2
+
+@pytest.mark.asyncio
+async def test_page_limit():
+    """Test that pagination stops after the maximum page count"""
+    fake = FakeEndpoint([{"address": str(i)} for i in range(100)])
+    client = _client(fake)
+    holders = await _collect(client._iter_offset_pages("/token-holders/token", 2, max_pages=3))
+    assert len(holders) == 6
+    assert fake.calls == 3
+
+@pytest.mark.asyncio
+async def test_transfers_endpoint_ignoring_offset():
+    """Test that transfer pagination shares the repeated page guard"""
+    fake = FakeEndpoint([{"signature": str(i)} for i in range(2)], ignore_offset=True)
+    transfers = await _collect(_client(fake).iter_token_transfers("token", page_size=2))
+    assert len(transfers) == 2
+    assert fake.calls == 2
+
+@pytest.mark.asyncio
+async def test_identical_rows_kept():
+    """Test that identical rows on different pages are not dropped"""
+    fake = FakeEndpoint([{"address": "a"}, {"address": "b"}, {"address": "a"}, {"address": "c"}])
+    holders = await _collect(_client(fake).iter_token_holders("token", page_size=2))
+    assert [h["address"] for h in holders] == ["a", "b", "a", "c"]
@@ -0,0 +1,31 @@
+"""Tests for JSON serialization helpers"""
+import pytest
+from src.utils import json_utils
+
+def test_round_trip(tmp_path):
+    """Test writing and reading a JSON file"""
+    data = {"wallets": ["a", "b"], "interactions": {"a": [{"amount": 1.5}]}}
+    path = tmp_path / "data.json"
+    
+    json_utils.write_json(path, data)
+    assert json_utils.read_json(path) == data
+
+def test_indent_option():
+    """Test compact and indented output"""
+    assert b"\n" not in json_utils.dumps({"a": 1})
+    assert b"\n" in json_utils.dumps({"a": 1}, indent=True)
+
+def test_stdlib_fallback(monkeypatch):
+    """Test that the stdlib encoder is used when orjson is missing"""
+    monkeypatch.setattr(json_utils, "ORJSON_AVAILABLE", False)
+    encoded = json_utils.dumps({"a": [1, 2]})
+    assert json_utils.loads(encoded) == {"a": [1, 2]}
+
+def test_read_json_mapping_streaming(tmp_path):
+    """Test that large files are stream-parsed to the same mapping"""
+    data = {"token1": {"2024-01-01": [{"amount": 1.5}]}, "token2": {}}
+    path = tmp_path / "history.json"
+    json_utils.write_json(path, data)
+    
+    assert json_utils.read_json_mapping(path) == data
+    assert json_utils.read_json_mapping(path, threshold=0) == data
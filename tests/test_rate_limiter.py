@@ -0,0 +1,27 @@
+"""Tests for the async token-bucket rate limiter"""
+import pytest
+import asyncio
+import time
+from src.utils.rate_limiter import AsyncRateLimiter
+
+@pytest.mark.asyncio
+async def test_burst_within_capacity():
+    """Test that a full bucket allows an immediate burst"""
+    limiter = AsyncRateLimiter(5, 1)
+    start = time.monotonic()
+    for _ in range(5):
+        async with limiter:
+            pass
+    assert time.monotonic() - start < 0.1
+
+@pytest.mark.asyncio
+async def test_waits_when_empty():
+    """Test that acquiring past capacity waits for a refill"""
+    limiter = AsyncRateLimiter(2, 0.2)
+    await limiter.acquire()
+    await limiter.acquire()
+    assert not limiter.has_capacity()
+    
+    start = time.monotonic()
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.05
@@ -0,0 +1,45 @@
+"""Tests for the suspicious activity analyzer"""
+from datetime import datetime, timedelta
+from src.analyzers.suspicious_activity_analyzer import SuspiciousActivityAnalyzer, TradeArrays
+
+START = datetime(2024, 1, 1)
+
+def _trade(wallet, side, amount, minute, **extra):
+    return {
+        'wallet': wallet,
+        'side': side,
+        'amount': amount,
+        'price': 1.0,
+        'timestamp': START + timedelta(minutes=minute),
+        **extra
+    }
+
+def test_reciprocal_pair_from_matched_fills():
+    """Test that A selling to B and B selling back to A is detected"""
+    trades = [
+        _trade('A', 'sell', 100.0, 0), _trade('B', 'buy', 100.0, 0),
+        _trade('C', 'buy', 40.0, 1),
+        _trade('B', 'sell', 99.0, 5), _trade('A', 'buy', 99.0, 5)
+    ]
+    reciprocal = SuspiciousActivityAnalyzer()._detect_reciprocal_trades(trades, TradeArrays.from_trades(trades))
+    assert len(reciprocal) == 1
+    assert reciprocal[0]['trade1'] is trades[0]
+    assert reciprocal[0]['trade2'] is trades[3]
+
+def test_reciprocal_pair_from_counterparty():
+    """Test that recorded counterparties are used as the other side"""
+    trades = [
+        _trade('A', 'sell', 100.0, 0, counterparty='B'),
+        _trade('A', 'buy', 50.0, 2, counterparty='C'),
+        _trade('A', 'buy', 101.0, 5, counterparty='B')
+    ]
+    reciprocal = SuspiciousActivityAnalyzer()._detect_reciprocal_trades(trades, TradeArrays.from_trades(trades))
+    assert [(w['trade1'], w['trade2']) for w in reciprocal] == [(trades[0], trades[2])]
+
+def test_one_way_transfers_not_reciprocal():
+    """Test that transfers without a way back are not flagged"""
+    trades = [
+        _trade('A', 'sell', 100.0, 0), _trade('B', 'buy', 100.0, 0),
+        _trade('B', 'sell', 100.0, 5), _trade('C', 'buy', 100.0, 5)
+    ]
+    assert SuspiciousActivityAnalyzer()._detect_reciprocal_trades(trades, TradeArrays.from_trades(trades)) == []
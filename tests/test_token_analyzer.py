@@ -0,0 +1,63 @@
+"""Tests for the token analyzer"""
+import pytest
+from types import SimpleNamespace
+from src.analysis.token_analyzer import TokenAnalyzer
+from src.utils.json_utils import read_json
+
+@pytest.fixture
+def analyzer(tmp_path):
+    analyzer = TokenAnalyzer()
+    analyzer.blacklist_file = tmp_path / "blacklist.json"
+    return analyzer
+
+@pytest.mark.asyncio
+async def test_blacklist_change_saved_on_close(analyzer):
+    """Test that a blacklist change made just before close reaches disk"""
+    analyzer._blacklist_writer.delay = 60
+
+    # A rejected deployer is blacklisted by the analysis pipeline
+    async def rejected(*args):
+        return {"passed": False, "reason": "deployer_history"}
+    analyzer._analyze_deployer = rejected
+    analyzer._analyze_holders = rejected
+    analyzer._analyze_twitter = rejected
+    analyzer.__dict__["supply_analyzer"] = SimpleNamespace(analyze_supply_distribution=rejected)
+
+    result = await analyzer.analyze_token("token", "deployer")
+    assert result == {"status": "rejected", "reason": "deployer_history"}
+    assert not analyzer.blacklist_file.exists()
+
+    await analyzer.aclose()
+    assert read_json(analyzer.blacklist_file)["deployers"] == ["deployer"]
+
+def test_stage_failures_return_copies(analyzer):
+    """Test that upstream stage failures resolve to fresh fallback results"""
+    error = ValueError("bad upstream data")
+    first = analyzer._resolve_stage_results([error, error, error, error])
+    first[0]["passed"] = True
+    second = analyzer._resolve_stage_results([error, error, error, error])
+    assert second[0] == {"passed": False, "reason": "analysis_error"}
+
+def test_stage_programming_errors_propagate(analyzer):
+    """Test that unexpected stage exceptions are re-raised"""
+    with pytest.raises(AttributeError):
+        analyzer._resolve_stage_results([{}, {}, AttributeError("bug"), {}])
+
+@pytest.mark.asyncio
+async def test_deployer_early_exit_failure_rate(analyzer):
+    """Test that an early exit reports the failure rate over all deployments"""
+    deployments = [{"token": f"token{i}"} for i in range(100)]
+
+    async def cached_deployments(deployer_address):
+        return deployments
+
+    async def classify(batch):
+        return 1, len(batch) - 1
+    analyzer._cached_deployments = cached_deployments
+    analyzer._classify_deployments = classify
+
+    result = await analyzer._analyze_deployer("deployer")
+    assert result["passed"]
+    assert result["decided_early"]
+    assert result["evaluated_deployments"] == 20
+    assert result["failure_rate"] == 1 / 100
@@ -0,0 +1,24 @@
+"""Tests for the typed transaction model"""
+from datetime import datetime, timezone
+from src.models.transaction import to_transactions
+
+def test_timestamps_coerced():
+    """Test that ISO strings and epoch seconds become datetimes"""
+    txs = to_transactions([
+        {"signature": "a", "timestamp": "2024-01-01T00:00:00", "amount": "1.5"},
+        {"signature": "b", "timestamp": 1704067200},
+        {"signature": "c"}
+    ])
+    assert txs[0].timestamp == datetime(2024, 1, 1)
+    assert txs[0].amount == 1.5
+    assert txs[1].timestamp == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert txs[2].timestamp is None
+
+def test_malformed_rows_dropped(caplog):
+    """Test that rows with a malformed timestamp are logged and dropped"""
+    txs = to_transactions([
+        {"signature": "a", "timestamp": "yesterday"},
+        {"signature": "b", "timestamp": "2024-01-01T00:00:00"}
+    ])
+    assert [tx.signature for tx in txs] == ["b"]
+    assert "Skipping transaction a" in caplog.text
@@ -0,0 +1,103 @@
+"""Tests for transaction analysis"""
+import pytest
+from src.analysis import transaction_analysis
+from src.analysis.transaction_analysis import TransactionAnalysis, TxArrays
+from src.models.transaction import to_transactions
+
+TRANSACTIONS = [
+    {"signature": "sig1", "timestamp": "2024-01-01T00:00:00", "amount": 100.0, "from": "a", "to": "b"},
+    {"signature": "sig2", "timestamp": "2024-01-01T00:00:30", "amount": 50.0, "from": "b", "to": "a"},
+]
+
+class FakeHelius:
+    def __init__(self, transactions):
+        self.transactions = transactions
+
+    async def get_token_transactions(self, token_address):
+        return self.transactions
+
+    async def close(self):
+        pass
+
+@pytest.fixture
+def make_analysis(tmp_path, monkeypatch):
+    monkeypatch.setenv("HELIUS_API_KEY", "test")
+    monkeypatch.setenv("JUPITER_API_KEY", "test")
+
+    def make(transactions=TRANSACTIONS):
+        analysis = TransactionAnalysis(data_dir=tmp_path)
+        analysis.helius = FakeHelius(transactions)
+        return analysis
+    return make
+
+@pytest.mark.asyncio
+async def test_history_append_and_compact(make_analysis):
+    """Test that fetched transactions are logged, replayed and compacted"""
+    transaction_analysis._transactions_cache.clear()
+    analysis = make_analysis()
+    await analysis._cached_transactions("token")
+    assert analysis.history_log.exists()
+    expected = {
+        "2024-01-01T00:00:00": [TRANSACTIONS[0]],
+        "2024-01-01T00:00:30": [TRANSACTIONS[1]]
+    }
+    assert analysis.transaction_history["token"] == expected
+
+    # A reload replays the log; refetching the same transactions adds nothing
+    reloaded = make_analysis()
+    assert reloaded.transaction_history["token"] == expected
+    await reloaded._record_history("token", TRANSACTIONS)
+    assert reloaded.transaction_history["token"] == expected
+
+    await reloaded._compact_history()
+    assert not reloaded.history_log.exists()
+    if transaction_analysis.PYARROW_AVAILABLE:
+        assert reloaded.history_parquet.exists()
+    assert make_analysis().transaction_history["token"] == expected
+
+@pytest.mark.asyncio
+async def test_failed_compaction_keeps_log(make_analysis):
+    """Test that records survive a compaction whose snapshot write fails"""
+    transaction_analysis._transactions_cache.clear()
+    analysis = make_analysis()
+    await analysis._cached_transactions("token")
+    expected = analysis.transaction_history["token"]
+
+    def fail(history):
+        raise OSError("disk full")
+    analysis._write_history_snapshot = fail
+    await analysis._compact_history()
+    assert not analysis.history_log.exists()
+    assert analysis.compacting_log.exists()
+    assert make_analysis().transaction_history["token"] == expected
+
+    # The next compaction folds the leftover log into the snapshot
+    del analysis._write_history_snapshot
+    await analysis._compact_history()
+    assert not analysis.compacting_log.exists()
+    assert make_analysis().transaction_history["token"] == expected
+
+def test_wash_trade_cycle_detected(make_analysis, caplog):
+    """Test that value cycling a -> b -> c -> a within a window is flagged"""
+    cycle = [
+        {"signature": f"sig{i}", "timestamp": 1704067200 + 10 * i, "amount": 100.0 + i,
+         "from_address": sender, "to_address": receiver}
+        for i, (sender, receiver) in enumerate([("a", "b"), ("b", "c"), ("c", "a")])
+    ]
+    untimed = {"signature": "sig3", "amount": 100.0, "from_address": "a", "to_address": "b"}
+    arr = TxArrays.from_transactions(to_transactions(cycle + [untimed]))
+
+    result = make_analysis()._detect_wash_trades(arr)
+    assert result["details"][0]["wallets"] == ["a", "b", "c"]
+    assert result["details"][0]["trade_count"] == 3
+    assert "Skipping 1 transactions without a timestamp" in caplog.text
+
+def test_one_way_transfers_not_wash_trades(make_analysis):
+    """Test that transfers without a cycle are not flagged"""
+    chain = [
+        {"signature": f"sig{i}", "timestamp": 1704067200 + 10 * i, "amount": 100.0,
+         "from_address": sender, "to_address": receiver}
+        for i, (sender, receiver) in enumerate([("a", "b"), ("b", "c"), ("c", "d")])
+    ]
+    arr = TxArrays.from_transactions(to_transactions(chain))
+    assert make_analysis()._detect_wash_trades(arr) is None
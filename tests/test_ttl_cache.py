@@ -0,0 +1,60 @@
+"""Tests for the in-process TTL cache"""
+import asyncio
+import time
+import pytest
+from src.caching.ttl_cache import TTLCache
+
+def test_get_set():
+    """Test basic get and set"""
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert "a" in cache
+
+def test_expiry():
+    """Test that entries expire after their TTL"""
+    cache = TTLCache(maxsize=4, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+@pytest.mark.asyncio
+async def test_get_or_compute_coalesces():
+    """Test that concurrent misses for one key share a single computation"""
+    cache = TTLCache(maxsize=4, ttl=60)
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*[cache.get_or_compute("a", factory) for _ in range(5)])
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    assert await cache.get_or_compute("a", factory) == "value"
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_get_or_compute_skips_none():
+    """Test that None results are not cached"""
+    cache = TTLCache(maxsize=4, ttl=60)
+
+    async def factory():
+        return None
+
+    assert await cache.get_or_compute("a", factory) is None
+    assert "a" not in cache
@@ -0,0 +1,30 @@
+"""Tests for the wallet tracker"""
+import pytest
+from src.analysis.wallet_tracker import WalletTracker
+from src.utils.json_utils import read_json
+
+@pytest.fixture
+def tracker(tmp_path, monkeypatch):
+    monkeypatch.setenv("HELIUS_API_KEY", "test")
+    monkeypatch.setenv("JUPITER_API_KEY", "test")
+    tracker = WalletTracker()
+    tracker.wallet_file = tmp_path / "wallet_data.json"
+    return tracker
+
+@pytest.mark.asyncio
+async def test_classification_saved_on_close(tracker):
+    """Test that a classification made just before close reaches disk"""
+    tracker._writer.delay = 60
+
+    async def analyze_wallet(address):
+        return {"address": address, "classification": "sniper", "last_updated_ts": 0}
+    tracker.analyze_wallet = analyze_wallet
+
+    await tracker.update_wallet_classification("wallet1")
+    assert tracker.is_sniper("wallet1")
+    assert not tracker.wallet_file.exists()
+
+    await tracker.aclose()
+    data = read_json(tracker.wallet_file)
+    assert data["sniper_wallets"] == ["wallet1"]
+    assert data["wallet_stats"]["wallet1"]["classification"] == "sniper"
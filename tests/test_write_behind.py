@@ -0,0 +1,57 @@
+"""Tests for the write-behind persistence helper"""
+import asyncio
+from src.utils.write_behind import WriteBehind
+
+def _writer(state, saved, delay=0.01):
+    return WriteBehind(lambda: dict(state), saved.append, delay=delay, name="test")
+
+def test_changes_are_coalesced():
+    """Test that a burst of changes is saved once"""
+    state, saved = {}, []
+
+    async def run():
+        writer = _writer(state, saved)
+        for i in range(5):
+            state[i] = i
+            writer.mark_dirty()
+        await asyncio.sleep(0.05)
+        await writer.aclose()
+
+    asyncio.run(run())
+    assert saved == [{0: 0, 1: 1, 2: 2, 3: 3, 4: 4}]
+
+def test_aclose_saves_pending_changes():
+    """Test that a change made just before close is saved"""
+    state, saved = {}, []
+
+    async def run():
+        writer = _writer(state, saved, delay=60)
+        state["a"] = 1
+        writer.mark_dirty()
+        await writer.aclose()
+
+    asyncio.run(run())
+    assert saved == [{"a": 1}]
+
+def test_loop_shutdown_saves_pending_changes():
+    """Test that changes are saved when the loop cancels the writer without aclose"""
+    state, saved = {}, []
+
+    async def run():
+        writer = _writer(state, saved, delay=60)
+        state["a"] = 1
+        writer.mark_dirty()
+        return writer
+
+    writer = asyncio.run(run())
+    assert saved == [{"a": 1}]
+    assert not writer.unsaved
+
+def test_writes_immediately_without_loop():
+    """Test that changes outside an event loop are written right away"""
+    state, saved = {"a": 1}, []
+    writer = _writer(state, saved)
+    writer.mark_dirty()
+    assert saved == [{"a": 1}]
+    writer.flush()
+    assert len(saved) == 1